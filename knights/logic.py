@@ -1,12 +1,33 @@
+import concurrent.futures
+import functools
+import heapq
 import itertools
+import multiprocessing
+import os
+import re
+import time
+import weakref
+
+
+class EvaluationException(Exception):
+    """Raised when a sentence cannot be evaluated in a model."""
 
 
 class Sentence():
+    __slots__ = ("_hash", "_symbols", "__weakref__")
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
 
+    def partial(self, model):
+        """
+        Evaluates the logical sentence in a model that may leave symbols
+        out, using Kleene's three-valued logic: returns True or False if
+        every completion of the model agrees, and None otherwise.
+        """
+        raise Exception("nothing to evaluate")
+
     def formula(self):
         """Returns string formula representing logical sentence."""
         return ""
@@ -15,6 +36,13 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def source(self, names):
+        """
+        Returns a Python expression for the logical sentence, given a dict
+        mapping each symbol name to an expression for its value.
+        """
+        raise Exception("nothing to compile")
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -43,6 +71,7 @@ class Sentence():
 
 
 class Symbol(Sentence):
+    __slots__ = ("name",)
 
     def __init__(self, name):
         self.name = name
@@ -60,7 +89,10 @@ class Symbol(Sentence):
         try:
             return bool(model[self.name])
         except KeyError:
-            raise Exception(f"variable {self.name} not in model")
+            raise EvaluationException(f"variable {self.name} not in model")
+
+    def partial(self, model):
+        return model.get(self.name)
 
     def formula(self):
         return self.name
@@ -68,8 +100,16 @@ class Symbol(Sentence):
     def symbols(self):
         return {self.name}
 
+    def source(self, names):
+        try:
+            return names[self.name]
+        except KeyError:
+            raise EvaluationException(f"variable {self.name} not in symbols")
+
 
 class Not(Sentence):
+    __slots__ = ("operand",)
+
     def __init__(self, operand):
         Sentence.validate(operand)
         self.operand = operand
@@ -86,21 +126,31 @@ class Not(Sentence):
     def evaluate(self, model):
         return not self.operand.evaluate(model)
 
+    def partial(self, model):
+        value = self.operand.partial(model)
+        return None if value is None else not value
+
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
     def symbols(self):
         return self.operand.symbols()
 
+    def source(self, names):
+        return f"(not {self.operand.source(names)})"
+
 
 class And(Sentence):
+    __slots__ = ("conjuncts",)
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
         self.conjuncts = list(conjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return (isinstance(other, And)
+                and tuple(self.conjuncts) == tuple(other.conjuncts))
 
     def __hash__(self):
         return hash(
@@ -120,6 +170,16 @@ class And(Sentence):
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
+    def partial(self, model):
+        result = True
+        for conjunct in self.conjuncts:
+            value = conjunct.partial(model)
+            if value is False:
+                return False
+            elif value is None:
+                result = None
+        return result
+
     def formula(self):
         if len(self.conjuncts) == 1:
             return self.conjuncts[0].formula()
@@ -127,17 +187,27 @@ class And(Sentence):
                            for conjunct in self.conjuncts])
 
     def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+        return set().union(*[conjunct.symbols() for conjunct in self.conjuncts])
+
+    def source(self, names):
+        if not self.conjuncts:
+            return "True"
+        return "(" + " and ".join(
+            [conjunct.source(names) for conjunct in self.conjuncts]
+        ) + ")"
 
 
 class Or(Sentence):
+    __slots__ = ("disjuncts",)
+
     def __init__(self, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
         self.disjuncts = list(disjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
+        return (isinstance(other, Or)
+                and tuple(self.disjuncts) == tuple(other.disjuncts))
 
     def __hash__(self):
         return hash(
@@ -151,6 +221,16 @@ class Or(Sentence):
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
+    def partial(self, model):
+        result = False
+        for disjunct in self.disjuncts:
+            value = disjunct.partial(model)
+            if value is True:
+                return True
+            elif value is None:
+                result = None
+        return result
+
     def formula(self):
         if len(self.disjuncts) == 1:
             return self.disjuncts[0].formula()
@@ -158,10 +238,19 @@ class Or(Sentence):
                             for disjunct in self.disjuncts])
 
     def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+        return set().union(*[disjunct.symbols() for disjunct in self.disjuncts])
+
+    def source(self, names):
+        if not self.disjuncts:
+            return "False"
+        return "(" + " or ".join(
+            [disjunct.source(names) for disjunct in self.disjuncts]
+        ) + ")"
 
 
 class Implication(Sentence):
+    __slots__ = ("antecedent", "consequent")
+
     def __init__(self, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
@@ -183,6 +272,17 @@ class Implication(Sentence):
         return ((not self.antecedent.evaluate(model))
                 or self.consequent.evaluate(model))
 
+    def partial(self, model):
+        antecedent = self.antecedent.partial(model)
+        if antecedent is False:
+            return True
+        consequent = self.consequent.partial(model)
+        if consequent is True:
+            return True
+        elif antecedent is True and consequent is False:
+            return False
+        return None
+
     def formula(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
@@ -191,8 +291,15 @@ class Implication(Sentence):
     def symbols(self):
         return set.union(self.antecedent.symbols(), self.consequent.symbols())
 
+    def source(self, names):
+        antecedent = self.antecedent.source(names)
+        consequent = self.consequent.source(names)
+        return f"((not {antecedent}) or {consequent})"
+
 
 class Biconditional(Sentence):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
@@ -216,23 +323,380 @@ class Biconditional(Sentence):
                 or (not self.left.evaluate(model)
                     and not self.right.evaluate(model)))
 
+    def partial(self, model):
+        left = self.left.partial(model)
+        if left is None:
+            return None
+        right = self.right.partial(model)
+        if right is None:
+            return None
+        return left == right
+
     def formula(self):
-        left = Sentence.parenthesize(str(self.left))
-        right = Sentence.parenthesize(str(self.right))
+        left = Sentence.parenthesize(self.left.formula())
+        right = Sentence.parenthesize(self.right.formula())
         return f"{left} <=> {right}"
 
     def symbols(self):
         return set.union(self.left.symbols(), self.right.symbols())
 
+    def source(self, names):
+        left = self.left.source(names)
+        right = self.right.source(names)
+        return f"(bool({left}) == bool({right}))"
+
+
+class Frozen():
+    """
+    Mixin for the immutable sentences made by freeze(). Their hash and
+    symbols are computed once, when they are made, and cached.
+    """
+    __slots__ = ()
+
+    def cache(self):
+        object.__setattr__(self, "_hash", super().__hash__())
+        object.__setattr__(self, "_symbols", frozenset(super().symbols()))
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    def __setattr__(self, name, value):
+        raise AttributeError("frozen sentences cannot be changed")
+
+    def __hash__(self):
+        return self._hash
+
+    def __getstate__(self):
+        # Hashes of strings differ between processes, so the cache is
+        # rebuilt rather than pickled
+        return None, {name: getattr(self, name) for name in self.parts}
+
+    def __setstate__(self, state):
+        for name, value in state[1].items():
+            object.__setattr__(self, name, value)
+        self.cache()
+
+    def add(self, conjunct):
+        raise TypeError("cannot add to a frozen sentence")
+
+    def symbols(self):
+        return set(self._symbols)
+
+
+class FrozenSymbol(Frozen, Symbol):
+    __slots__ = ()
+    parts = Symbol.__slots__
+
+
+class FrozenNot(Frozen, Not):
+    __slots__ = ()
+    parts = Not.__slots__
+
+
+class FrozenAnd(Frozen, And):
+    __slots__ = ()
+    parts = And.__slots__
+
+
+class FrozenOr(Frozen, Or):
+    __slots__ = ()
+    parts = Or.__slots__
+
+
+class FrozenImplication(Frozen, Implication):
+    __slots__ = ()
+    parts = Implication.__slots__
+
+
+class FrozenBiconditional(Frozen, Biconditional):
+    __slots__ = ()
+    parts = Biconditional.__slots__
+
+
+# Every live frozen sentence, keyed by its class and parts
+interned = weakref.WeakValueDictionary()
+
+
+def freeze(sentence):
+    """
+    Returns an immutable copy of a sentence in which equal subsentences are
+    one shared object, with cached hashes and symbols. Build knowledge with
+    And.add as usual, then freeze it before checking many queries.
+    """
+    if isinstance(sentence, Frozen):
+        return sentence
+    elif isinstance(sentence, Symbol):
+        cls, parts = FrozenSymbol, (sentence.name,)
+    elif isinstance(sentence, Not):
+        cls, parts = FrozenNot, (freeze(sentence.operand),)
+    elif isinstance(sentence, And):
+        cls, parts = FrozenAnd, (tuple(freeze(c) for c in sentence.conjuncts),)
+    elif isinstance(sentence, Or):
+        cls, parts = FrozenOr, (tuple(freeze(d) for d in sentence.disjuncts),)
+    elif isinstance(sentence, Implication):
+        cls, parts = FrozenImplication, (freeze(sentence.antecedent),
+                                         freeze(sentence.consequent))
+    elif isinstance(sentence, Biconditional):
+        cls, parts = FrozenBiconditional, (freeze(sentence.left),
+                                           freeze(sentence.right))
+    else:
+        raise TypeError("must be a logical sentence")
+
+    key = (cls, parts)
+    frozen = interned.get(key)
+    if frozen is None:
+        frozen = object.__new__(cls)
+        for name, value in zip(cls.parts, parts):
+            object.__setattr__(frozen, name, value)
+        frozen.cache()
+        interned[key] = frozen
+    return frozen
+
+
+class ParseException(Exception):
+    """Raised when text is not a well-formed formula."""
+
+
+# Operators, in the notation formula() writes and in ASCII
+NOT = "¬"
+AND = "∧"
+OR = "∨"
+IMPLIES = "=>"
+IFF = "<=>"
+OPERATORS = {
+    "¬": NOT, "~": NOT, "!": NOT,
+    "∧": AND, "&": AND,
+    "∨": OR, "|": OR,
+    "=>": IMPLIES, "->": IMPLIES,
+    "<=>": IFF, "<->": IFF,
+    "(": "(", ")": ")",
+}
+
+# Binding power of each binary operator; => and <=> group to the right
+BINDING = {IFF: 1, IMPLIES: 2, OR: 3, AND: 4}
+
+# An operator, or a symbol name: words that may be separated by spaces
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<operator><=>|<->|=>|->|[¬~!∧&∨|()])
+      | (?P<name>[^\s¬~!∧&∨|()<=>-]+(?:[ \t]+[^\s¬~!∧&∨|()<=>-]+)*)
+    )\s*
+""", re.VERBOSE)
+
+
+class Parser():
+    """
+    Pratt parser for formulas in the notation formula() writes.
+
+    The text is split into tokens in one pass, and each operator then
+    parses its operands with the binding power that decides how far they
+    reach. A run of the same ∧ or ∨ becomes one And or Or, while a
+    parenthesized run stays its own sentence, so parsing a formula()
+    gives back the sentence that wrote it.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        position = 0
+        for match in TOKEN.finditer(text):
+            if match.start() != position:
+                break
+            operator = match["operator"]
+            if operator:
+                self.tokens.append((OPERATORS[operator], position))
+            else:
+                self.tokens.append((Symbol, match["name"]))
+            position = match.end()
+        if position < len(text) and not text[position:].isspace():
+            raise ParseException(f"unexpected {text[position]!r} at {position}")
+        self.index = 0
+
+    def peek(self):
+        if self.index < len(self.tokens):
+            return self.tokens[self.index][0]
+        return None
+
+    def advance(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def parse(self):
+        """Returns the sentence the whole text describes."""
+        if not self.tokens:
+            raise ParseException("empty formula")
+        sentence = self.expression(0)
+        if self.index < len(self.tokens):
+            raise ParseException(f"unexpected {self.peek()} at {self.tokens[self.index][1]}")
+        return sentence
+
+    def expression(self, power):
+        """Parses operators binding tighter than power."""
+        left = self.operand()
+        while True:
+            operator = self.peek()
+            binding = BINDING.get(operator)
+            if binding is None or binding <= power:
+                return left
+            self.advance()
+            if operator == AND or operator == OR:
+                operands = [left, self.expression(binding)]
+                while self.peek() == operator:
+                    self.advance()
+                    operands.append(self.expression(binding))
+                left = And(*operands) if operator == AND else Or(*operands)
+            elif operator == IMPLIES:
+                left = Implication(left, self.expression(binding - 1))
+            else:
+                left = Biconditional(left, self.expression(binding - 1))
+
+    def operand(self):
+        """Parses a symbol, a negation or a parenthesized formula."""
+        if self.index >= len(self.tokens):
+            raise ParseException("formula ends too soon")
+        kind, value = self.advance()
+        if kind is Symbol:
+            return Symbol(value)
+        elif kind == NOT:
+            return Not(self.operand())
+        elif kind == "(":
+            sentence = self.expression(0)
+            if self.peek() != ")":
+                raise ParseException(f"unclosed parenthesis at {value}")
+            self.advance()
+            return sentence
+        raise ParseException(f"unexpected {kind} at {value}")
+
+
+def parse(text):
+    """
+    Returns the sentence a formula describes, written as formula() writes
+    it or with ~ or ! for ¬, & for ∧, | for ∨, -> for => and <-> for <=>.
+    """
+    return Parser(text).parse()
+
+
+def parse_lines(lines):
+    """
+    Yields the sentence on each line of an iterable of lines, such as an
+    open file, skipping blank lines and lines starting with #, so that
+    large files are read one line at a time.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            yield parse(line)
+        except ParseException as e:
+            raise ParseException(f"line {number}: {e}") from None
+
+
+def load_knowledge(path):
+    """
+    Returns a knowledge base of the sentences in a file, one per line.
+    """
+    with open(path, encoding="utf-8") as f:
+        return And(*parse_lines(f))
+
+
+def model_check(knowledge, query, backend="dpll"):
+    """
+    Checks if knowledge base entails query, using the named backend:
+    "enumerate" evaluates every model in a truth table, "compiled" does the
+    same with compiled evaluators, "numpy" evaluates whole blocks of models
+    as bit arrays, "prune" cuts the truth table short on partial models,
+    "dpll" proves knowledge ∧ ¬query unsatisfiable, "bdd" compiles both
+    into a binary decision diagram, and "parallel" splits the truth table
+    across a process pool.
+    """
+    try:
+        check = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown model_check backend {backend}")
+    return check(freeze(knowledge), freeze(query))
+
+
+# Answers from entailed()
+YES = "YES"
+NO = "NO"
+MAYBE = "MAYBE"
+
+
+def entailed(knowledge, queries):
+    """
+    Checks many queries against one knowledge base, enumerating its models
+    only once. Returns a dict mapping each query to YES if the knowledge
+    base entails it, NO if it entails the query's negation, or MAYBE.
+    """
+    knowledge = freeze(knowledge)
+    queries = list(queries)
+    symbols = tuple(sorted(set().union(
+        knowledge.symbols(), *[query.symbols() for query in queries]
+    )))
+    position = {name: i for i, name in enumerate(symbols)}
+    knowledge_true = compile_evaluator(knowledge, symbols, bitmask=True)
+
+    # Symbol queries only need to know which bits are set in every model
+    # and in some model; anything else is evaluated in each model kept
+    keep = any(literal_symbol(query) is None for query in queries)
+    always = 2 ** len(symbols) - 1
+    ever = 0
+    models = []
+    for model in range(2 ** len(symbols)):
+        if knowledge_true(model):
+            always &= model
+            ever |= model
+            if keep:
+                models.append(model)
+
+    answers = {}
+    for query in queries:
+        name = literal_symbol(query)
+        if name is not None:
+            bit = position[name]
+            true_in_all = bool(always >> bit & 1)
+            true_in_some = bool(ever >> bit & 1)
+            if isinstance(query, Not):
+                true_in_all, true_in_some = not true_in_some, not true_in_all
+        else:
+            query_true = compile_evaluator(freeze(query), symbols, bitmask=True)
+            values = [bool(query_true(model)) for model in models]
+            true_in_all = all(values)
+            true_in_some = any(values)
+
+        if true_in_all:
+            answers[query] = YES
+        elif not true_in_some:
+            answers[query] = NO
+        else:
+            answers[query] = MAYBE
+    return answers
+
+
+def literal_symbol(sentence):
+    """
+    Returns the symbol name if sentence is a symbol or a negated symbol,
+    or None otherwise.
+    """
+    if isinstance(sentence, Not):
+        sentence = sentence.operand
+    if isinstance(sentence, Symbol):
+        return sentence.name
+    return None
+
+
+def model_check_enumerate(knowledge, query, stats=None):
+    """
+    Checks if knowledge base entails query by enumerating all models.
+    If given a stats dict, counts the complete models checked in "leaves".
+    """
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
 
         # If model has an assignment for each symbol
         if not symbols:
+            if stats is not None:
+                stats["leaves"] = stats.get("leaves", 0) + 1
 
             # If knowledge base is true in model, then query must also be true
             if knowledge.evaluate(model):
@@ -261,3 +725,1005 @@ def model_check(knowledge, query):
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+def model_check_prune(knowledge, query, stats=None, ordered=True):
+    """
+    Checks if knowledge base entails query by enumerating models, but
+    evaluates both on every partial model along the way. A branch is cut
+    off as soon as the knowledge base is false, or the query true, in
+    every completion of it.
+
+    With `ordered`, the symbols occurring most often are assigned first,
+    so sentences are decided sooner. If given a stats dict, counts the
+    branches where the search stopped in "leaves".
+    """
+    counts = symbol_counts(knowledge)
+    for name, count in symbol_counts(query).items():
+        counts[name] = counts.get(name, 0) + count
+    if ordered:
+        symbols = sorted(counts, key=lambda name: (-counts[name], name))
+    else:
+        symbols = sorted(counts)
+
+    def check_all(index, model):
+        """Checks if knowledge base entails query in every completion of model."""
+        knowledge_value = knowledge.partial(model)
+        query_value = query.partial(model)
+        if knowledge_value is False or query_value is True:
+            decided = True
+        elif knowledge_value is True and query_value is False:
+            decided = False
+        else:
+            decided = None
+
+        if decided is not None:
+            if stats is not None:
+                stats["leaves"] = stats.get("leaves", 0) + 1
+            return decided
+
+        # Try both values of the next symbol in the same model
+        p = symbols[index]
+        model[p] = True
+        entails = check_all(index + 1, model)
+        if entails:
+            model[p] = False
+            entails = check_all(index + 1, model)
+        del model[p]
+        return entails
+
+    return check_all(0, dict())
+
+
+def symbol_counts(sentence, counts=None):
+    """Returns a dict of how many times each symbol occurs in sentence."""
+    if counts is None:
+        counts = dict()
+    if isinstance(sentence, Symbol):
+        counts[sentence.name] = counts.get(sentence.name, 0) + 1
+    elif isinstance(sentence, Not):
+        symbol_counts(sentence.operand, counts)
+    elif isinstance(sentence, And):
+        for conjunct in sentence.conjuncts:
+            symbol_counts(conjunct, counts)
+    elif isinstance(sentence, Or):
+        for disjunct in sentence.disjuncts:
+            symbol_counts(disjunct, counts)
+    elif isinstance(sentence, Implication):
+        symbol_counts(sentence.antecedent, counts)
+        symbol_counts(sentence.consequent, counts)
+    elif isinstance(sentence, Biconditional):
+        symbol_counts(sentence.left, counts)
+        symbol_counts(sentence.right, counts)
+    return counts
+
+
+def models(knowledge, symbols=None):
+    """
+    Yields the models of a knowledge base one at a time, each a new dict
+    from symbol name to truth value, without building the truth table.
+    Models also assign any extra symbol names given in `symbols`.
+
+    Partial models the knowledge base is false in are abandoned at once,
+    and once it is true every completion is yielded without evaluating it.
+    """
+    knowledge = freeze(knowledge)
+    counts = symbol_counts(knowledge)
+    names = sorted(counts, key=lambda name: (-counts[name], name))
+    names += sorted(set(symbols or ()) - set(counts))
+    model = dict()
+
+    def extend(index):
+        value = knowledge.partial(model)
+        if value is False:
+            return
+        if value is True:
+            rest = names[index:]
+            for values in itertools.product((True, False), repeat=len(rest)):
+                completion = model.copy()
+                completion.update(zip(rest, values))
+                yield completion
+            return
+        p = names[index]
+        for value in (True, False):
+            model[p] = value
+            yield from extend(index + 1)
+        del model[p]
+
+    return extend(0)
+
+
+def model_check_compiled(knowledge, query):
+    """
+    Checks if knowledge base entails query by evaluating compiled
+    evaluators over every model.
+    """
+    symbols = tuple(sorted(set.union(knowledge.symbols(), query.symbols())))
+    knowledge_true = compile_evaluator(knowledge, symbols)
+    query_true = compile_evaluator(query, symbols)
+    for values in itertools.product((True, False), repeat=len(symbols)):
+        if knowledge_true(values) and not query_true(values):
+            return False
+    return True
+
+
+# Fewer symbols than this are checked in-process by model_check_parallel,
+# since starting the pool would take longer than the check
+PARALLEL_MIN_SYMBOLS = 20
+
+# Models a parallel worker checks between looking for a stop request
+PARALLEL_POLL = 4096
+
+# Evaluators and stop event of a model_check_parallel worker process
+worker = dict()
+
+
+def model_check_parallel(knowledge, query, workers=None, prefix_bits=None):
+    """
+    Checks if knowledge base entails query by enumerating models in a
+    process pool.
+
+    The values of the last `prefix_bits` symbols (by default enough for
+    about four tasks per worker) split the models into 2 ** prefix_bits
+    prefixes, and each task checks every model under one prefix with
+    compiled evaluators. Once any task finds a counterexample, the
+    remaining tasks are cancelled and running ones stop at their next poll.
+    """
+    symbols = tuple(sorted(set.union(knowledge.symbols(), query.symbols())))
+    if len(symbols) < PARALLEL_MIN_SYMBOLS:
+        return model_check_compiled(knowledge, query)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if prefix_bits is None:
+        prefix_bits = (4 * workers - 1).bit_length()
+    prefix_bits = min(prefix_bits, len(symbols))
+    suffix_bits = len(symbols) - prefix_bits
+
+    stop = multiprocessing.Event()
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, initializer=start_worker,
+        initargs=(stop, knowledge, query, symbols)
+    ) as pool:
+        futures = [pool.submit(check_prefix, prefix, suffix_bits)
+                   for prefix in range(2 ** prefix_bits)]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                if not future.result():
+                    return False
+            return True
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+
+
+def start_worker(stop, knowledge, query, symbols):
+    """Compiles the evaluators a model_check_parallel worker needs."""
+    worker["stop"] = stop
+    worker["knowledge"] = compile_evaluator(knowledge, symbols, bitmask=True)
+    worker["query"] = compile_evaluator(query, symbols, bitmask=True)
+
+
+def check_prefix(prefix, suffix_bits):
+    """
+    Checks every model whose high bits are prefix, in a model_check_parallel
+    worker. Returns False on a counterexample, and True if there is none or
+    the check was stopped.
+    """
+    knowledge_true = worker["knowledge"]
+    query_true = worker["query"]
+    stop = worker["stop"]
+    start = prefix << suffix_bits
+    end = start + (1 << suffix_bits)
+    for block in range(start, end, PARALLEL_POLL):
+        if stop.is_set():
+            return True
+        for model in range(block, min(block + PARALLEL_POLL, end)):
+            if knowledge_true(model) and not query_true(model):
+                return False
+    return True
+
+
+@functools.lru_cache(maxsize=256)
+def compile_evaluator(sentence, symbols, bitmask=False):
+    """
+    Compiles a sentence into a Python function of one argument that returns
+    a truthy value exactly when the sentence is true.
+
+    `symbols` is a tuple of symbol names fixing their positions. The
+    function takes a tuple with the value of symbols[i] at index i, or with
+    `bitmask`, an int whose bit i is the value of symbols[i]. Evaluators are
+    cached, so callers can ask for the same one repeatedly.
+    """
+    if bitmask:
+        names = {name: f"(v >> {i} & 1)" for i, name in enumerate(symbols)}
+    else:
+        names = {name: f"v[{i}]" for i, name in enumerate(symbols)}
+    try:
+        return eval(compile(f"lambda v: {sentence.source(names)}",
+                            "<sentence>", "eval"))
+    except (SyntaxError, RecursionError, MemoryError):
+
+        # Too deeply nested for the compiler: walk the tree instead
+        if bitmask:
+            return lambda v: sentence.evaluate(
+                {name: bool(v >> i & 1) for i, name in enumerate(symbols)})
+        return lambda v: sentence.evaluate(dict(zip(symbols, v)))
+
+
+# Models evaluated at once by the numpy backend, as a power of two
+NUMPY_CHUNK_BITS = 20
+
+# 64-bit words whose bit b is bit i of b, for i from 0 to 5
+WORD_PATTERNS = [
+    0xAAAAAAAAAAAAAAAA,
+    0xCCCCCCCCCCCCCCCC,
+    0xF0F0F0F0F0F0F0F0,
+    0xFF00FF00FF00FF00,
+    0xFFFF0000FFFF0000,
+    0xFFFFFFFF00000000,
+]
+
+
+def model_check_numpy(knowledge, query):
+    """
+    Checks if knowledge base entails query by evaluating both over every
+    model at once with NumPy.
+
+    Model m assigns each symbol i the value of bit i of m. Each symbol is a
+    packed bit-column holding its value in 64 models per uint64 word, and
+    sentences are evaluated with whole-array bitwise operations. Models
+    are processed 2 ** NUMPY_CHUNK_BITS at a time, so memory stays bounded
+    however many symbols there are.
+    """
+    import numpy as np
+
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    low = min(len(symbols), NUMPY_CHUNK_BITS)
+    words = max(1, 2 ** low // 64)
+    ones = np.full(words, 2 ** 64 - 1, dtype=np.uint64)
+    zeros = np.zeros(words, dtype=np.uint64)
+
+    # Only the first 2 ** low bits are models when that is less than a word
+    valid = np.uint64(2 ** (2 ** low) - 1 if low < 6 else 2 ** 64 - 1)
+
+    # The first `low` symbols vary within a chunk, the rest across chunks
+    index = np.arange(words, dtype=np.uint64)
+    columns = {}
+    for i, name in enumerate(symbols[:low]):
+        if i < 6:
+            columns[name] = np.full(words, WORD_PATTERNS[i], dtype=np.uint64)
+        else:
+            bit = (index >> np.uint64(i - 6)) & np.uint64(1)
+            columns[name] = np.where(bit == 1, ones, zeros)
+
+    for chunk in range(2 ** (len(symbols) - low)):
+        for i, name in enumerate(symbols[low:]):
+            columns[name] = ones if chunk >> i & 1 else zeros
+        counterexamples = (bit_column(knowledge, columns, ones)
+                           & ~bit_column(query, columns, ones))
+        if (counterexamples & valid).any():
+            return False
+    return True
+
+
+def bit_column(sentence, columns, ones):
+    """
+    Returns the packed bit-column of a sentence's value in every model,
+    given the columns of its symbols and a column of all ones.
+    """
+    if isinstance(sentence, Symbol):
+        return columns[sentence.name]
+    elif isinstance(sentence, Not):
+        return ~bit_column(sentence.operand, columns, ones)
+    elif isinstance(sentence, And):
+        column = ones
+        for conjunct in sentence.conjuncts:
+            column = column & bit_column(conjunct, columns, ones)
+        return column
+    elif isinstance(sentence, Or):
+        column = ~ones
+        for disjunct in sentence.disjuncts:
+            column = column | bit_column(disjunct, columns, ones)
+        return column
+    elif isinstance(sentence, Implication):
+        return (~bit_column(sentence.antecedent, columns, ones)
+                | bit_column(sentence.consequent, columns, ones))
+    elif isinstance(sentence, Biconditional):
+        return ~(bit_column(sentence.left, columns, ones)
+                 ^ bit_column(sentence.right, columns, ones))
+    raise TypeError(f"cannot evaluate {type(sentence).__name__}")
+
+
+def model_check_dpll(knowledge, query):
+    """Checks if knowledge base entails query with the DPLL solver."""
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(Not(query))
+    return not DPLL(cnf.clauses, cnf.count).solve()
+
+
+def satisfiable(sentence):
+    """
+    Returns a model (a dict from symbol name to truth value) in which the
+    sentence is true, or None if there is no such model.
+    """
+    cnf = CNF()
+    cnf.add(sentence)
+    solver = DPLL(cnf.clauses, cnf.count)
+    if not solver.solve():
+        return None
+    return {name: solver.value[var] == 1 for name, var in cnf.variables.items()}
+
+
+def model_count(knowledge, symbols=None):
+    """
+    Returns the exact number of models of a knowledge base over its
+    symbols and any extra symbol names in `symbols`, without enumerating
+    them.
+    """
+    cnf = CNF()
+    cnf.add(freeze(knowledge))
+    extra = len(set(symbols or ()) - set(cnf.variables))
+    clauses = frozenset(frozenset(clause) for clause in cnf.clauses
+                        if not tautology(frozenset(clause)))
+    variables = frozenset(range(1, cnf.count + 1))
+    return ModelCounter().count(clauses, variables) << extra
+
+
+class ModelCounter():
+    """
+    Exact model counter (#SAT) for clauses of integer literals.
+
+    Clauses are frozensets of literals. After unit propagation, clauses
+    sharing no variables are split into components, which are counted
+    separately and multiplied; each component's count is cached, so a
+    component reached again along another branch is never recounted.
+    Tseitin variables are defined by their subsentences, so counting the
+    CNF of a sentence counts the sentence's own models.
+    """
+
+    def __init__(self):
+        self.cache = dict()
+
+    def count(self, clauses, variables):
+        """Returns the number of assignments to variables satisfying clauses."""
+        clauses, assigned = propagate_units(clauses)
+        if clauses is None:
+            return 0
+        variables = variables - assigned
+        used = {abs(literal) for clause in clauses for literal in clause}
+        total = 1 << len(variables - used)
+        for component in components(clauses):
+            total *= self.component(component)
+            if not total:
+                break
+        return total
+
+    def component(self, clauses):
+        """Returns the number of models of a connected set of clauses."""
+        if clauses in self.cache:
+            return self.cache[clauses]
+        occurrences = dict()
+        for clause in clauses:
+            for literal in clause:
+                occurrences[abs(literal)] = occurrences.get(abs(literal), 0) + 1
+        variables = frozenset(occurrences)
+        variable = max(occurrences, key=occurrences.get)
+        rest = variables - {variable}
+        result = (self.count(condition(clauses, variable), rest)
+                  + self.count(condition(clauses, -variable), rest))
+        self.cache[clauses] = result
+        return result
+
+
+def condition(clauses, literal):
+    """Returns clauses simplified by making literal true."""
+    return frozenset(clause - {-literal} for clause in clauses
+                     if literal not in clause)
+
+
+def propagate_units(clauses):
+    """
+    Makes unit clauses true until none are left. Returns the simplified
+    clauses, or None on a conflict, and the set of variables assigned.
+    """
+    assigned = set()
+    while True:
+        if frozenset() in clauses:
+            return None, assigned
+        unit = next((clause for clause in clauses if len(clause) == 1), None)
+        if unit is None:
+            return clauses, assigned
+        literal, = unit
+        assigned.add(abs(literal))
+        clauses = condition(clauses, literal)
+
+
+def components(clauses):
+    """Returns the clauses split into sets sharing no variables."""
+    by_variable = dict()
+    for clause in clauses:
+        for literal in clause:
+            by_variable.setdefault(abs(literal), []).append(clause)
+    seen = set()
+    found = []
+    for clause in clauses:
+        if clause in seen:
+            continue
+        seen.add(clause)
+        component = []
+        stack = [clause]
+        while stack:
+            current = stack.pop()
+            component.append(current)
+            for literal in current:
+                for other in by_variable[abs(literal)]:
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+        found.append(frozenset(component))
+    return found
+
+
+class CNF():
+    """
+    Conjunctive normal form of sentences, built by Tseitin encoding.
+
+    Variables are positive integers and a literal is a variable or its
+    negation; `clauses` is a list of lists of literals. Symbols are mapped
+    to variables in `variables`, and every compound subsentence gets a
+    fresh variable defined to be equivalent to it, so the clauses grow
+    linearly with the size of the sentences added.
+    """
+
+    def __init__(self):
+        self.variables = {}
+        self.clauses = []
+        self.count = 0
+
+        # Literal for each subsentence already encoded, keyed by id()
+        self.literals = {}
+
+    def variable(self, name):
+        """Returns the variable for a symbol name, allocating it if new."""
+        if name not in self.variables:
+            self.variables[name] = self.fresh()
+        return self.variables[name]
+
+    def fresh(self):
+        """Returns a new variable."""
+        self.count += 1
+        return self.count
+
+    def add(self, sentence):
+        """Adds clauses asserting that sentence is true."""
+        Sentence.validate(sentence)
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append([self.literal(disjunct)
+                                 for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            self.clauses.append([-self.literal(sentence.antecedent),
+                                 self.literal(sentence.consequent)])
+        else:
+            self.clauses.append([self.literal(sentence)])
+
+    def literal(self, sentence):
+        """Returns a literal equivalent to sentence."""
+        key = id(sentence)
+        if key in self.literals:
+            return self.literals[key][0]
+
+        if isinstance(sentence, Symbol):
+            literal = self.variable(sentence.name)
+        elif isinstance(sentence, Not):
+            literal = -self.literal(sentence.operand)
+        elif isinstance(sentence, And):
+            literal = self.define_and(
+                [self.literal(conjunct) for conjunct in sentence.conjuncts])
+        elif isinstance(sentence, Or):
+            literal = -self.define_and(
+                [-self.literal(disjunct) for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            literal = -self.define_and([self.literal(sentence.antecedent),
+                                        -self.literal(sentence.consequent)])
+        elif isinstance(sentence, Biconditional):
+            left = self.literal(sentence.left)
+            right = self.literal(sentence.right)
+            literal = self.fresh()
+            self.clauses.extend([[-literal, -left, right],
+                                 [-literal, left, -right],
+                                 [literal, left, right],
+                                 [literal, -left, -right]])
+        else:
+            raise TypeError(f"cannot encode {type(sentence).__name__}")
+
+        # Keep the sentence alive so its id() is not reused
+        self.literals[key] = (literal, sentence)
+        return literal
+
+    def define_and(self, literals):
+        """Returns a new variable defined to be the conjunction of literals."""
+        variable = self.fresh()
+        for literal in literals:
+            self.clauses.append([-variable, literal])
+        self.clauses.append([variable] + [-literal for literal in literals])
+        return variable
+
+
+class ClauseStore():
+    """
+    Set of clauses, each a frozenset of integer literals, with an index
+    from every literal to the clauses containing it, so that resolution
+    partners and subsumption candidates are looked up rather than searched.
+    """
+
+    def __init__(self):
+        self.clauses = set()
+        self.index = dict()
+
+    def __len__(self):
+        return len(self.clauses)
+
+    def add(self, clause):
+        self.clauses.add(clause)
+        for literal in clause:
+            self.index.setdefault(literal, set()).add(clause)
+
+    def remove(self, clause):
+        self.clauses.discard(clause)
+        for literal in clause:
+            self.index[literal].discard(clause)
+
+    def containing(self, literal):
+        """Returns the clauses containing literal."""
+        return self.index.get(literal, ())
+
+    def subsumes(self, clause):
+        """Checks if some stored clause is a subset of clause."""
+        for literal in clause:
+            for other in self.containing(literal):
+                if other <= clause:
+                    return True
+        return False
+
+    def subsumed_by(self, clause):
+        """Returns the stored clauses that clause is a subset of."""
+        if not clause:
+            return set(self.clauses)
+        candidates = sorted((self.containing(literal) for literal in clause), key=len)
+        return set(candidates[0]).intersection(*candidates[1:])
+
+
+def tautology(clause):
+    """Checks if a clause contains a literal and its negation."""
+    return any(-literal in clause for literal in clause)
+
+
+def prove(knowledge, query, steps=None, time_limit=None, stats=None):
+    """
+    Tries to prove that knowledge base entails query by resolution
+    refutation: derives the empty clause from the CNF of knowledge ∧ ¬query.
+
+    Resolution uses the set-of-support strategy: every resolvent has a
+    parent descending from ¬query, which is complete as long as the
+    knowledge base itself is consistent. Tautologies are dropped and
+    clauses subsumed by a kept clause are discarded, in both directions.
+    Clauses are taken shortest first.
+
+    Returns True once the empty clause is derived, False if the clauses
+    are saturated without it, and None if `steps` given clauses or
+    `time_limit` seconds run out first. If `stats` is a dict, the counts
+    of given clauses, resolvents, tautologies and subsumed clauses, the
+    clauses kept and the seconds taken are added to it.
+    """
+    start = time.perf_counter()
+    counts = {"given": 0, "resolvents": 0, "tautologies": 0, "subsumed": 0}
+
+    cnf = CNF()
+    cnf.add(knowledge)
+    usable = len(cnf.clauses)
+    cnf.add(Not(query))
+
+    def result(proved):
+        if stats is not None:
+            for key, value in counts.items():
+                stats[key] = stats.get(key, 0) + value
+            stats["clauses"] = stats.get("clauses", 0) + len(kept)
+            stats["seconds"] = stats.get("seconds", 0) + time.perf_counter() - start
+        return proved
+
+    # Knowledge base clauses only resolve against the set of support
+    kept = ClauseStore()
+    support = []
+    seen = set()
+    for n, literals in enumerate(cnf.clauses):
+        clause = frozenset(literals)
+        if tautology(clause):
+            counts["tautologies"] += 1
+        elif not clause:
+            return result(True)
+        elif clause not in seen:
+            seen.add(clause)
+            if n < usable:
+                kept.add(clause)
+            else:
+                heapq.heappush(support, (len(clause), len(seen), clause))
+
+    while support:
+        if steps is not None and counts["given"] >= steps:
+            return result(None)
+        if time_limit is not None and time.perf_counter() - start >= time_limit:
+            return result(None)
+        _, _, given = heapq.heappop(support)
+        if kept.subsumes(given):
+            counts["subsumed"] += 1
+            continue
+        counts["given"] += 1
+
+        # Resolve against every kept clause with a complementary literal
+        for literal in given:
+            for other in list(kept.containing(-literal)):
+                resolvent = (given - {literal}) | (other - {-literal})
+                counts["resolvents"] += 1
+                if not resolvent:
+                    return result(True)
+                if tautology(resolvent):
+                    counts["tautologies"] += 1
+                elif resolvent in seen or kept.subsumes(resolvent):
+                    counts["subsumed"] += 1
+                else:
+                    seen.add(resolvent)
+                    heapq.heappush(support, (len(resolvent), len(seen), resolvent))
+
+        # Keep the given clause, dropping kept clauses it subsumes
+        for other in kept.subsumed_by(given):
+            kept.remove(other)
+            counts["subsumed"] += 1
+        kept.add(given)
+
+    return result(False)
+
+
+class DPLL():
+    """
+    DPLL satisfiability solver for clauses of integer literals.
+
+    Unit propagation uses two watched literals per clause, so assigning a
+    variable only visits the clauses watching its negation, and nothing
+    has to be undone on backtracking. Pure literals are assigned before the
+    search starts; branching picks the unassigned variable that occurs in
+    the most clauses, true first.
+    """
+
+    def __init__(self, clauses, count):
+        self.count = count
+
+        # value[v] is 1 (true), -1 (false) or 0 (unassigned)
+        self.value = [0] * (count + 1)
+        self.trail = []
+        self.head = 0
+
+        self.clauses = []
+        self.watches = {}
+        self.units = []
+        self.conflict = False
+        occurrences = [0] * (count + 1)
+        for clause in clauses:
+            clause = list(dict.fromkeys(clause))
+            if any(-literal in clause for literal in clause):
+                continue
+            for literal in clause:
+                occurrences[abs(literal)] += 1
+            if not clause:
+                self.conflict = True
+            elif len(clause) == 1:
+                self.units.append(clause[0])
+            else:
+                self.clauses.append(clause)
+                self.watches.setdefault(clause[0], []).append(clause)
+                self.watches.setdefault(clause[1], []).append(clause)
+        self.order = sorted(range(1, count + 1),
+                            key=lambda v: occurrences[v], reverse=True)
+
+    def literal_value(self, literal):
+        """Returns 1, -1 or 0 for a true, false or unassigned literal."""
+        value = self.value[abs(literal)]
+        return value if literal > 0 else -value
+
+    def assign(self, literal):
+        """Makes literal true; returns False if it was already false."""
+        value = self.literal_value(literal)
+        if value:
+            return value == 1
+        self.value[abs(literal)] = 1 if literal > 0 else -1
+        self.trail.append(literal)
+        return True
+
+    def undo(self, start):
+        """Unassigns everything on the trail from position start."""
+        for literal in self.trail[start:]:
+            self.value[abs(literal)] = 0
+        del self.trail[start:]
+        self.head = start
+
+    def propagate(self):
+        """Runs unit propagation; returns False on a conflict."""
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches.get(false)
+            if not watching:
+                continue
+
+            kept = []
+            for n, clause in enumerate(watching):
+
+                # Keep the falsified watch in position 1
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.literal_value(clause[0]) == 1:
+                    kept.append(clause)
+                    continue
+
+                # Move the watch to any literal that is not false
+                for i in range(2, len(clause)):
+                    if self.literal_value(clause[i]) != -1:
+                        clause[1], clause[i] = clause[i], clause[1]
+                        self.watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    # Every other literal is false: clause is unit or violated
+                    kept.append(clause)
+                    if not self.assign(clause[0]):
+                        kept.extend(watching[n + 1:])
+                        self.watches[false] = kept
+                        return False
+            self.watches[false] = kept
+        return True
+
+    def assign_pure(self):
+        """Assigns every literal whose negation occurs in no clause."""
+        polarity = [0] * (self.count + 1)
+        for clause in self.clauses + [[unit] for unit in self.units]:
+            for literal in clause:
+                polarity[abs(literal)] |= 1 if literal > 0 else 2
+        for variable in range(1, self.count + 1):
+            if polarity[variable] == 1:
+                self.assign(variable)
+            elif polarity[variable] == 2:
+                self.assign(-variable)
+
+    def solve(self):
+        """Returns True if the clauses are satisfiable, leaving a model in value."""
+        if self.conflict:
+            return False
+        for unit in self.units:
+            if not self.assign(unit):
+                return False
+        self.assign_pure()
+        if not self.propagate():
+            return False
+
+        # Stack of (decision literal, trail position, both values tried)
+        decisions = []
+        while True:
+            variable = next((v for v in self.order if not self.value[v]), None)
+            if variable is None:
+                return True
+            decisions.append((variable, len(self.trail), False))
+            self.assign(variable)
+
+            while not self.propagate():
+
+                # Backtrack to the latest decision with a value left to try
+                while True:
+                    if not decisions:
+                        return False
+                    literal, start, flipped = decisions.pop()
+                    self.undo(start)
+                    if not flipped:
+                        decisions.append((-literal, start, True))
+                        self.assign(-literal)
+                        break
+
+
+def variable_order(sentence, heuristic="appearance"):
+    """
+    Returns a list of the sentence's symbol names in the order a BDD should
+    test them: "appearance" keeps symbols in the order they first occur,
+    so symbols of the same clause sit near each other, "occurrence" puts
+    the most frequent symbols first, and "name" sorts them.
+    """
+    if heuristic == "appearance":
+        return list(symbol_counts(sentence))
+    elif heuristic == "occurrence":
+        counts = symbol_counts(sentence)
+        return sorted(counts, key=lambda name: (-counts[name], name))
+    elif heuristic == "name":
+        return sorted(sentence.symbols())
+    raise ValueError(f"unknown variable order {heuristic}")
+
+
+class BDD():
+    """
+    Reduced ordered binary decision diagram of a knowledge base.
+
+    Nodes are integers: 0 and 1 are the false and true terminals, and every
+    other node tests the variable at its level, going to `low` when it is
+    false and `high` when it is true. A unique table keeps one node per
+    (level, low, high), so equal functions are equal integers, and every
+    operation goes through a cached if-then-else.
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, knowledge, order="appearance"):
+        knowledge = freeze(knowledge)
+        self.names = variable_order(knowledge, order)
+        self.levels = {name: i for i, name in enumerate(self.names)}
+
+        # Node fields, indexed by node; terminals sit below every level
+        self.level = [float("inf"), float("inf")]
+        self.low = [None, None]
+        self.high = [None, None]
+
+        self.unique = dict()
+        self.cache = dict()
+        self.compiled = dict()
+        self.root = self.compile(knowledge)
+
+    def node(self, level, low, high):
+        """Returns the node testing level, sharing any equal node."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.level)
+            self.level.append(level)
+            self.low.append(low)
+            self.high.append(high)
+            self.unique[key] = node
+        return node
+
+    def variable(self, name):
+        """
+        Returns the node for a symbol, adding symbols the knowledge base
+        does not mention below all others.
+        """
+        if name not in self.levels:
+            self.levels[name] = len(self.names)
+            self.names.append(name)
+        return self.node(self.levels[name], BDD.FALSE, BDD.TRUE)
+
+    def ite(self, f, g, h):
+        """Returns the node for (f ∧ g) ∨ (¬f ∧ h)."""
+        if f == BDD.TRUE:
+            return g
+        if f == BDD.FALSE:
+            return h
+        if g == h:
+            return g
+        if g == BDD.TRUE and h == BDD.FALSE:
+            return f
+        key = (f, g, h)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+
+        top = min(self.level[f], self.level[g], self.level[h])
+        branches = []
+        for side in (self.low, self.high):
+            branches.append(self.ite(
+                *[side[n] if self.level[n] == top else n for n in (f, g, h)]
+            ))
+        result = self.node(top, *branches)
+        self.cache[key] = result
+        return result
+
+    def negate(self, f):
+        return self.ite(f, BDD.FALSE, BDD.TRUE)
+
+    def compile(self, sentence):
+        """Returns the node for a sentence."""
+        sentence = freeze(sentence)
+        node = self.compiled.get(sentence)
+        if node is not None:
+            return node
+        if isinstance(sentence, Symbol):
+            node = self.variable(sentence.name)
+        elif isinstance(sentence, Not):
+            node = self.negate(self.compile(sentence.operand))
+        elif isinstance(sentence, And):
+            node = BDD.TRUE
+            for conjunct in sentence.conjuncts:
+                node = self.ite(node, self.compile(conjunct), BDD.FALSE)
+        elif isinstance(sentence, Or):
+            node = BDD.FALSE
+            for disjunct in sentence.disjuncts:
+                node = self.ite(node, BDD.TRUE, self.compile(disjunct))
+        elif isinstance(sentence, Implication):
+            node = self.ite(self.compile(sentence.antecedent),
+                            self.compile(sentence.consequent), BDD.TRUE)
+        elif isinstance(sentence, Biconditional):
+            right = self.compile(sentence.right)
+            node = self.ite(self.compile(sentence.left),
+                            right, self.negate(right))
+        else:
+            raise TypeError("must be a logical sentence")
+        self.compiled[sentence] = node
+        return node
+
+    def entails(self, query):
+        """Checks if the knowledge base entails query."""
+        return self.ite(self.root, self.compile(query), BDD.TRUE) == BDD.TRUE
+
+    def count(self, node=None):
+        """
+        Returns the number of models of a node, by default the knowledge
+        base, over every symbol the diagram knows.
+        """
+        if node is None:
+            node = self.root
+        bottom = len(self.names)
+
+        def level(n):
+            return bottom if n <= BDD.TRUE else self.level[n]
+
+        counts = {BDD.FALSE: 0, BDD.TRUE: 1}
+
+        def models(n):
+            if n not in counts:
+                low, high = self.low[n], self.high[n]
+                counts[n] = ((models(low) << (level(low) - level(n) - 1))
+                             + (models(high) << (level(high) - level(n) - 1)))
+            return counts[n]
+
+        return models(node) << level(node)
+
+    def forced(self):
+        """
+        Returns a dict from each symbol whose value is the same in every
+        model of the knowledge base to that value.
+        """
+        values = dict()
+        for name in list(self.names):
+            symbol = self.variable(name)
+            if self.ite(self.root, symbol, BDD.TRUE) == BDD.TRUE:
+                values[name] = True
+            elif self.ite(self.root, self.negate(symbol), BDD.TRUE) == BDD.TRUE:
+                values[name] = False
+        return values
+
+    def size(self):
+        """Returns the number of nodes reachable from the knowledge base."""
+        seen = set()
+        stack = [self.root]
+        while stack:
+            n = stack.pop()
+            if n not in seen:
+                seen.add(n)
+                if n > BDD.TRUE:
+                    stack.extend((self.low[n], self.high[n]))
+        return len(seen)
+
+
+def model_check_bdd(knowledge, query):
+    """Checks if knowledge base entails query by compiling both to a BDD."""
+    return BDD(knowledge).entails(query)
+
+
+BACKENDS = {
+    "enumerate": model_check_enumerate,
+    "compiled": model_check_compiled,
+    "numpy": model_check_numpy,
+    "prune": model_check_prune,
+    "dpll": model_check_dpll,
+    "bdd": model_check_bdd,
+    "parallel": model_check_parallel,
+}
@@ -0,0 +1,56 @@
+"""
+Compares asking model_check about every symbol of the knights and clue
+knowledge bases with compiling each knowledge base to a BDD once and
+asking the diagram, and reports the diagram's size under each variable
+order heuristic.
+
+Usage: python bdd_benchmark.py
+"""
+
+import time
+
+from evaluate_benchmark import knowledge_bases
+from logic import *
+
+# Variable order heuristics to report BDD sizes for
+ORDERS = ["appearance", "occurrence", "name"]
+
+
+def timed(function, *arguments):
+    """
+    Returns function's result and the seconds it took.
+    """
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def ask_model_check(knowledge, queries, backend):
+    return [model_check(knowledge, query, backend=backend) for query in queries]
+
+
+def ask_bdd(bdd, queries):
+    return [bdd.entails(query) for query in queries]
+
+
+def main():
+    print(f"{'knowledge':>12} {'queries':>8} {'enumerate':>10} {'dpll':>10} "
+          f"{'compile':>10} {'bdd':>10}  " + " ".join(f"{order:>10}" for order in ORDERS))
+    for name, knowledge in knowledge_bases():
+        if name == "mastermind":
+            continue
+        queries = [Symbol(symbol) for symbol in sorted(knowledge.symbols())]
+        enumerated, enumerate_time = timed(ask_model_check, knowledge, queries, "enumerate")
+        proved, dpll_time = timed(ask_model_check, knowledge, queries, "dpll")
+        bdd, compile_time = timed(BDD, knowledge)
+        answers, bdd_time = timed(ask_bdd, bdd, queries)
+        assert enumerated == proved == answers
+
+        sizes = [BDD(knowledge, order).size() for order in ORDERS]
+        print(f"{name:>12} {len(queries):>8} {enumerate_time:>9.4f}s {dpll_time:>9.4f}s "
+              f"{compile_time:>9.4f}s {bdd_time:>9.4f}s  "
+              + " ".join(f"{size:>10}" for size in sizes))
+
+
+if __name__ == "__main__":
+    main()
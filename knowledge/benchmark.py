@@ -0,0 +1,179 @@
+"""
+Benchmark suite for model_check: times every backend on the knights
+puzzles, clue, mastermind and harry, and on random 3-SAT knowledge bases
+of 10 to 40 symbols. Rows where a backend hands a knowledge base too small
+for it to another backend say which one actually ran.
+
+For each knowledge base and backend it reports the time per query, the
+peak memory of one query and, for the truth-table backends, how many
+models per second the backend checks. The peak memory of parallel is
+that of the parent process only, as tracemalloc does not see the
+workers. Prints a table and writes everything as JSON, so runs can be
+compared for regressions.
+
+Usage: python benchmark.py [--backends B ...] [--queries N] [--unlimited]
+                           [--seed S] [--output FILE]
+"""
+
+import argparse
+import datetime
+import importlib.util
+import json
+import random
+import time
+import tracemalloc
+
+from evaluate_benchmark import knowledge_bases
+from logic import *
+
+# Symbol counts of the random 3-SAT knowledge bases
+RANDOM_SIZES = [10, 20, 25, 30, 40]
+
+# Clauses per symbol in random 3-SAT, low enough to stay satisfiable
+CLAUSE_RATIO = 3
+
+# Backends that check every model of the truth table
+TRUTH_TABLE = {"enumerate", "compiled", "numpy", "parallel"}
+
+# Most symbols each backend is run on by default: the truth-table
+# backends grow as 2^n, and pruning and BDDs blow up on random 3-SAT
+SYMBOL_LIMITS = {
+    "enumerate": 14,
+    "compiled": 14,
+    "numpy": 30,
+    "parallel": 25,
+    "prune": 20,
+    "bdd": 20,
+}
+
+
+def fallback(backend, symbols):
+    """
+    Returns the backend that really answers for `backend` on a knowledge
+    base with this many symbols, or None if it answers itself.
+    """
+    if backend == "parallel" and symbols < PARALLEL_MIN_SYMBOLS:
+        return "compiled"
+    return None
+
+
+def random_3sat(symbols, rng):
+    """
+    Returns a random 3-SAT knowledge base over the given number of symbols.
+    """
+    names = [Symbol(f"P{i}") for i in range(symbols)]
+    return And(*[
+        Or(*[name if rng.random() < 0.5 else Not(name)
+             for name in rng.sample(names, 3)])
+        for _ in range(CLAUSE_RATIO * symbols)
+    ])
+
+
+def workloads(seed):
+    """
+    Returns a list of (name, knowledge) pairs to benchmark.
+    """
+    bases = knowledge_bases()
+    bases.append(("harry", __import__("harry").knowledge))
+    rng = random.Random(seed)
+    for symbols in RANDOM_SIZES:
+        bases.append((f"3sat{symbols}", random_3sat(symbols, rng)))
+    return bases
+
+
+def models_per_second(knowledge, backend):
+    """
+    Returns how many models per second a truth-table backend checks, by
+    timing whether the knowledge base entails itself: that holds in every
+    model, so no counterexample cuts the 2^n models short.
+    """
+    start = time.perf_counter()
+    model_check(knowledge, knowledge, backend=backend)
+    return 2 ** len(knowledge.symbols()) / (time.perf_counter() - start)
+
+
+def measure(knowledge, queries, backend):
+    """
+    Returns the seconds per query of a backend and the peak bytes
+    allocated while it answers the first query.
+    """
+    start = time.perf_counter()
+    for query in queries:
+        model_check(knowledge, query, backend=backend)
+    per_query = (time.perf_counter() - start) / len(queries)
+
+    tracemalloc.start()
+    model_check(knowledge, queries[0], backend=backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_query, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model_check backends.")
+    parser.add_argument("--backends", nargs="*", default=list(BACKENDS),
+                        help=f"backends to time, from {', '.join(BACKENDS)}")
+    parser.add_argument("--queries", type=int, default=4,
+                        help="symbols to ask about per knowledge base")
+    parser.add_argument("--unlimited", action="store_true",
+                        help="run every backend on every knowledge base")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json",
+                        help="file to write JSON results to")
+    args = parser.parse_args()
+
+    for backend in args.backends:
+        if backend not in BACKENDS:
+            parser.error(f"unknown backend {backend}")
+    backends = list(args.backends)
+    if "numpy" in backends and importlib.util.find_spec("numpy") is None:
+        backends.remove("numpy")
+
+    print(f"{'knowledge':>12} {'symbols':>8} {'backend':>18} {'ms/query':>10} "
+          f"{'models/s':>12} {'peak KiB':>10}")
+    results = []
+    for name, knowledge in workloads(args.seed):
+        knowledge = freeze(knowledge)
+        symbols = sorted(knowledge.symbols())
+        queries = [Symbol(symbol) for symbol in symbols[:args.queries]]
+        for backend in backends:
+            row = {
+                "knowledge": name,
+                "symbols": len(symbols),
+                "backend": backend,
+                "queries": len(queries),
+            }
+            limit = SYMBOL_LIMITS.get(backend)
+            if not args.unlimited and limit is not None and len(symbols) > limit:
+                row["skipped"] = f"more than {limit} symbols"
+                results.append(row)
+                continue
+            per_query, peak = measure(knowledge, queries, backend)
+            row["seconds_per_query"] = per_query
+            row["peak_bytes"] = peak
+            row["fallback"] = fallback(backend, len(symbols))
+            ran = row["fallback"] or backend
+            if ran in TRUTH_TABLE:
+                row["models_per_second"] = models_per_second(knowledge, backend)
+            if ran == "parallel":
+                row["peak_scope"] = "parent process"
+            results.append(row)
+            label = backend if row["fallback"] is None else f"{backend}>{row['fallback']}"
+            rate = f"{row['models_per_second']:.0f}" if "models_per_second" in row else "-"
+            marker = "*" if "peak_scope" in row else ""
+            print(f"{name:>12} {len(symbols):>8} {label:>18} {per_query * 1000:>10.3f} "
+                  f"{rate:>12} {peak / 1024:>10.1f}{marker}")
+
+    if any("peak_scope" in row for row in results):
+        print("* peak of the parent process only; tracemalloc does not see the workers")
+    with open(args.output, "w") as f:
+        json.dump({
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "config": vars(args),
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,10 +21,11 @@ symbols = characters + rooms + weapons
 
 
 def check_knowledge(knowledge):
+    answers = entailed(knowledge, symbols)
     for symbol in symbols:
-        if model_check(knowledge, symbol):
+        if answers[symbol] == YES:
             termcolor.cprint(f"{symbol}: YES", "green")
-        elif not model_check(knowledge, Not(symbol)):
+        elif answers[symbol] == MAYBE:
             print(f"{symbol}: MAYBE")
 
 
@@ -49,4 +50,5 @@ knowledge.add(Or(
 knowledge.add(Not(plum))
 knowledge.add(Not(ballroom))
 
-check_knowledge(knowledge)
+if __name__ == "__main__":
+    check_knowledge(knowledge)
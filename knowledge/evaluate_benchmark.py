@@ -0,0 +1,66 @@
+"""
+Micro-benchmark of sentence evaluation: walking the Sentence tree with
+evaluate() against compiled evaluators over a tuple and over a bitmask,
+on the knights, clue and mastermind knowledge bases.
+
+Usage: python evaluate_benchmark.py [evaluations]
+"""
+
+import os
+import random
+import runpy
+import sys
+import time
+
+from logic import *
+
+KNIGHTS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       "..", "knights", "puzzle.py")
+
+
+def knowledge_bases():
+    """
+    Returns a list of (name, knowledge) pairs to benchmark.
+    """
+    bases = []
+    knights = runpy.run_path(KNIGHTS)
+    for n in range(4):
+        bases.append((f"knights{n}", knights[f"knowledge{n}"]))
+    for name in ["clue", "mastermind"]:
+        bases.append((name, __import__(name).knowledge))
+    return bases
+
+
+def rate(function, arguments):
+    """
+    Returns how many calls per second function makes over arguments.
+    """
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return len(arguments) / (time.perf_counter() - start)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python evaluate_benchmark.py [evaluations]")
+    evaluations = int(sys.argv[1]) if len(sys.argv) == 2 else 20000
+
+    print(f"{'knowledge':>12} {'symbols':>8} {'evaluate/s':>12} "
+          f"{'tuple/s':>12} {'bitmask/s':>12} {'speedup':>8}")
+    for name, knowledge in knowledge_bases():
+        symbols = tuple(sorted(knowledge.symbols()))
+        masks = [random.getrandbits(len(symbols)) for _ in range(evaluations)]
+        values = [tuple(bool(mask >> i & 1) for i in range(len(symbols)))
+                  for mask in masks]
+        models = [dict(zip(symbols, value)) for value in values]
+
+        tree = rate(knowledge.evaluate, models)
+        compiled = rate(compile_evaluator(knowledge, symbols), values)
+        bitmask = rate(compile_evaluator(knowledge, symbols, bitmask=True), masks)
+        print(f"{name:>12} {len(symbols):>8} {tree:>12.0f} {compiled:>12.0f} "
+              f"{bitmask:>12.0f} {compiled / tree:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -51,6 +51,8 @@ knowledge.add(And(
     Not(Symbol("yellow3"))
 ))
 
-for symbol in symbols:
-    if model_check(knowledge, symbol):
-        print(symbol)
+if __name__ == "__main__":
+    answers = entailed(knowledge, symbols)
+    for symbol in symbols:
+        if answers[symbol] == YES:
+            print(symbol)
@@ -0,0 +1,59 @@
+"""
+Measures parser throughput: writes a file of random three-literal clauses
+in formula() notation, streams it back through parse_lines(), and checks
+that every clause round-trips.
+
+Usage: python parse_benchmark.py [clauses]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from logic import *
+
+# Symbols the random clauses are drawn from
+SYMBOLS = [Symbol(f"P{i}") for i in range(100)]
+
+
+def random_clause(rng):
+    """
+    Returns a random disjunction of three literals.
+    """
+    return Or(*[
+        symbol if rng.random() < 0.5 else Not(symbol)
+        for symbol in rng.sample(SYMBOLS, 3)
+    ])
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python parse_benchmark.py [clauses]")
+    count = int(sys.argv[1]) if len(sys.argv) == 2 else 100000
+
+    rng = random.Random(0)
+    clauses = [random_clause(rng) for _ in range(count)]
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".txt",
+                                     delete=False) as f:
+        for clause in clauses:
+            print(clause.formula(), file=f)
+        path = f.name
+
+    try:
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            parsed = list(parse_lines(f))
+        elapsed = time.perf_counter() - start
+    finally:
+        os.remove(path)
+
+    assert parsed == clauses
+    print(f"{count} clauses, {size / 1e6:.1f} MB in {elapsed:.2f}s: "
+          f"{count / elapsed:.0f} clauses/s, {size / 1e6 / elapsed:.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
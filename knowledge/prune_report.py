@@ -0,0 +1,44 @@
+"""
+Reports how many truth-table leaves model_check visits when asking about
+every symbol of the knights, clue and mastermind knowledge bases: the full
+enumeration against partial-evaluation pruning, with symbols in name
+order and most frequent first.
+
+Usage: python prune_report.py
+"""
+
+import time
+
+from evaluate_benchmark import knowledge_bases
+from logic import *
+
+
+def leaves(check, knowledge, symbols, **options):
+    """
+    Returns the total leaves visited and seconds taken to check every
+    symbol against the knowledge base.
+    """
+    stats = {"leaves": 0}
+    start = time.perf_counter()
+    for symbol in symbols:
+        check(knowledge, Symbol(symbol), stats=stats, **options)
+    return stats["leaves"], time.perf_counter() - start
+
+
+def main():
+    print(f"{'knowledge':>12} {'enumerate':>18} {'prune by name':>18} "
+          f"{'prune by count':>18}")
+    for name, knowledge in knowledge_bases():
+        symbols = sorted(knowledge.symbols())
+        columns = [
+            leaves(model_check_enumerate, knowledge, symbols),
+            leaves(model_check_prune, knowledge, symbols, ordered=False),
+            leaves(model_check_prune, knowledge, symbols),
+        ]
+        print(f"{name:>12}" + "".join(
+            f" {count:>9} {seconds:>7.3f}s" for count, seconds in columns
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Proves or refutes every symbol of the knights, clue and mastermind
+knowledge bases by resolution and prints the prover's statistics.
+
+Usage: python resolution_report.py [steps]
+"""
+
+import sys
+
+from evaluate_benchmark import knowledge_bases
+from logic import *
+
+# Columns of prove() statistics to print
+COLUMNS = ["given", "resolvents", "tautologies", "subsumed", "clauses", "seconds"]
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python resolution_report.py [steps]")
+    steps = int(sys.argv[1]) if len(sys.argv) == 2 else None
+
+    print(f"{'knowledge':>12} {'proved':>7} {'unknown':>8} "
+          + " ".join(f"{column:>11}" for column in COLUMNS))
+    for name, knowledge in knowledge_bases():
+        stats = {}
+        results = [prove(knowledge, Symbol(symbol), steps=steps, stats=stats)
+                   for symbol in sorted(knowledge.symbols())]
+        print(f"{name:>12} {results.count(True):>7} {results.count(None):>8} "
+              + " ".join(f"{stats[column]:>11.4f}" if column == "seconds"
+                         else f"{stats[column]:>11}" for column in COLUMNS))
+
+
+if __name__ == "__main__":
+    main()
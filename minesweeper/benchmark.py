@@ -0,0 +1,81 @@
+"""
+Benchmark of MinesweeperAI inference on expert boards (16x30, 99 mines),
+with sentences stored as sets of cells and, in bitmask mode, as
+MaskSentences.
+
+Plays the same seeded games in both modes and reports the time
+add_knowledge() spends inferring per move, then times the subset tests
+and differences inference makes between the sentences the AI holds,
+both as Sentences and as MaskSentences.
+
+Usage: python benchmark.py [games]
+"""
+
+import itertools
+import random
+import sys
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI, MaskSentence
+from simulate import percentile, play_game
+
+HEIGHT, WIDTH, MINES = 16, 30, 99
+
+
+def final_knowledge(seed):
+    """
+    Plays a game until its second guess and returns the sentences the AI
+    knows then.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
+    ai = MinesweeperAI(height=HEIGHT, width=WIDTH, total_mines=MINES)
+    guesses = 0
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            guesses += 1
+            move = ai.make_random_move()
+        if move is None or game.is_mine(move) or guesses > 1:
+            return list(ai.knowledge)
+        ai.add_knowledge(move, game.nearby_mines(move))
+
+
+def rate(pairs):
+    """
+    Returns how many subset tests, with the difference when one holds,
+    run per second over pairs of sentences.
+    """
+    start = time.perf_counter()
+    for a, b in pairs:
+        if a.issubset(b):
+            b.difference(a)
+    return len(pairs) / (time.perf_counter() - start)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [games]")
+    games = int(sys.argv[1]) if len(sys.argv) == 2 else 20
+
+    print(f"{games} expert games")
+    for bitmask in (False, True):
+        results = [play_game(HEIGHT, WIDTH, MINES, seed, bitmask=bitmask)
+                   for seed in range(games)]
+        inference = [seconds for result in results for seconds in result["inference"]]
+        print(f"{'bitmask' if bitmask else 'sets':>8}: {len(inference)} moves, "
+              f"inference mean {sum(inference) / len(inference) * 1000:.3f} ms "
+              f"p99 {percentile(inference, 0.99) * 1000:.3f} ms "
+              f"total {sum(inference):.3f}s")
+
+    sentences = [sentence for seed in range(games) for sentence in final_knowledge(seed)]
+    pairs = list(itertools.permutations(sentences[:200], 2))
+    masked = {id(sentence): MaskSentence(sentence.cells, sentence.count, WIDTH)
+              for sentence in sentences[:200]}
+    mask_pairs = [(masked[id(a)], masked[id(b)]) for a, b in pairs]
+    print(f"subset and difference over {len(pairs)} sentence pairs: "
+          f"sets {rate(pairs):.0f}/s, bitmask {rate(mask_pairs):.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
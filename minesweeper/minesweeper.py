@@ -1,5 +1,14 @@
+import collections
 import itertools
+import math
 import random
+import time
+
+# Seconds the probability solver may spend counting before it estimates
+PROBABILITY_TIME_LIMIT = 0.5
+
+# Components with more cells than this are estimated, not counted
+MAX_COMPONENT_CELLS = 200
 
 
 class Minesweeper():
@@ -77,6 +86,27 @@ class Minesweeper():
 
         return count
 
+    def reveal(self, cell, revealed=()):
+        """
+        Reveals a safe cell, and flood-fills outward from cells with no
+        nearby mines, whose neighbors are all safe. Cells in `revealed` are
+        not revealed again. Returns a dict from each newly revealed cell to
+        its number of nearby mines, in the order they were revealed.
+        """
+        counts = {cell: self.nearby_mines(cell)}
+        frontier = collections.deque([cell])
+        while frontier:
+            i, j = frontier.popleft()
+            if counts[(i, j)] != 0:
+                continue
+            for row in range(max(i - 1, 0), min(i + 2, self.height)):
+                for col in range(max(j - 1, 0), min(j + 2, self.width)):
+                    neighbor = (row, col)
+                    if neighbor not in counts and neighbor not in revealed:
+                        counts[neighbor] = self.nearby_mines(neighbor)
+                        frontier.append(neighbor)
+        return counts
+
     def won(self):
         """
         Checks if all mines have been flagged.
@@ -84,6 +114,53 @@ class Minesweeper():
         return self.mines_found == self.mines
 
 
+class NumpyMinesweeper(Minesweeper):
+    """
+    Minesweeper game on a NumPy board, for large boards
+
+    Mines are placed with one draw of distinct cells, and every cell's
+    number of nearby mines is computed up front by convolving the board
+    with a 3x3 kernel, so nearby_mines() is a lookup. Mines are drawn from
+    `rng`, a numpy Generator, by default seeded from `random`.
+    """
+
+    def __init__(self, height=8, width=8, mines=8, rng=None):
+        import numpy as np
+
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+        self.height = height
+        self.width = width
+
+        # Add mines at distinct random cells
+        positions = rng.choice(height * width, size=mines, replace=False)
+        self.board = np.zeros((height, width), dtype=bool)
+        self.board.flat[positions] = True
+        self.mines = set(zip(*map(np.ndarray.tolist, np.divmod(positions, width))))
+
+        # Nearby mines: the sum of the 3x3 window around each cell,
+        # less the cell itself
+        padded = np.pad(self.board, 1).astype(np.uint8)
+        self.counts = sum(
+            padded[di:di + height, dj:dj + width]
+            for di in range(3) for dj in range(3)
+        ) - self.board
+
+        # At first, player has found no mines
+        self.mines_found = set()
+
+    def is_mine(self, cell):
+        return bool(self.board[cell])
+
+    def nearby_mines(self, cell):
+        """
+        Returns the number of mines that are
+        within one row and column of a given cell,
+        not including the cell itself.
+        """
+        return int(self.counts[cell])
+
+
 class Sentence():
     """
     Logical statement about a Minesweeper game
@@ -95,12 +172,34 @@ class Sentence():
         self.cells = set(cells)
         self.count = count
 
+    def __len__(self):
+        return len(self.cells)
+
     def __eq__(self, other):
         return self.cells == other.cells and self.count == other.count
 
     def __str__(self):
         return f"{self.cells} = {self.count}"
 
+    def key(self):
+        """
+        Returns a hashable form of the sentence, equal for equal sentences.
+        """
+        return (frozenset(self.cells), self.count)
+
+    def issubset(self, other):
+        """
+        Checks if every cell of this sentence is in other.
+        """
+        return self.cells <= other.cells
+
+    def difference(self, other):
+        """
+        Returns the sentence about this sentence's cells that are not in
+        other, whose count is the difference of the two counts.
+        """
+        return Sentence(self.cells - other.cells, self.count - other.count)
+
     def known_mines(self):
         """
         Returns the set of all cells in self.cells known to be mines.
@@ -137,17 +236,511 @@ class Sentence():
             self.cells.remove(cell)
 
 
+class MaskSentence(Sentence):
+    """
+    Sentence whose cells are stored as a bitmask over a board `width`
+    cells wide
+
+    Cell (i, j) is bit i * width + j, shifted down by `base` so the mask
+    stays small on large boards. Subsets, differences and sizes against
+    another MaskSentence of the same width are integer operations; against
+    anything else they fall back to comparing sets of cells. `cells` is
+    decoded from the mask and cached until the next change.
+    """
+
+    __slots__ = ("width", "count", "mask", "base", "decoded")
+
+    def __init__(self, cells, count, width):
+        cells = frozenset(cells)
+        self.width = width
+        self.count = count
+        bits = [i * width + j for i, j in cells]
+        base = min(bits, default=0)
+        mask = 0
+        for bit in bits:
+            mask |= 1 << (bit - base)
+        self.mask = mask
+        self.base = base
+        self.decoded = cells
+
+    @classmethod
+    def from_mask(cls, mask, base, count, width):
+        """
+        Returns the sentence with the given cell bitmask.
+        """
+        sentence = cls.__new__(cls)
+        sentence.width = width
+        sentence.count = count
+        sentence.set_mask(mask, base)
+        return sentence
+
+    def set_mask(self, mask, base):
+        """
+        Stores a cell bitmask starting at bit `base`, shifted down so that
+        its lowest cell is bit 0.
+        """
+        if mask:
+            low = (mask & -mask).bit_length() - 1
+            self.mask = mask >> low
+            self.base = base + low
+        else:
+            self.mask = 0
+            self.base = 0
+        self.decoded = None
+
+    @property
+    def cells(self):
+        """
+        The sentence's cells, decoded from the mask once per change.
+        """
+        if self.decoded is None:
+            cells = []
+            mask = self.mask
+            while mask:
+                low = mask & -mask
+                cells.append(divmod(self.base + low.bit_length() - 1, self.width))
+                mask ^= low
+            self.decoded = frozenset(cells)
+        return self.decoded
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __eq__(self, other):
+        if self.aligned(other):
+            return (self.mask == other.mask and self.base == other.base
+                    and self.count == other.count)
+        return super().__eq__(other)
+
+    def aligned(self, other):
+        """
+        Checks if other is a MaskSentence over the same board width, so
+        that the two masks can be compared bit for bit.
+        """
+        return isinstance(other, MaskSentence) and self.width == other.width
+
+    def key(self):
+        """
+        Returns a hashable form of the sentence, equal for equal sentences.
+        """
+        return (self.cells, self.count)
+
+    def issubset(self, other):
+        """
+        Checks if every cell of this sentence is in other.
+        """
+        if not self.aligned(other):
+            return super().issubset(other)
+        if not self.mask:
+            return True
+        # Masks start at their lowest cell, so a lower base is a cell other lacks
+        shift = self.base - other.base
+        return shift >= 0 and not (self.mask << shift) & ~other.mask
+
+    def difference(self, other):
+        """
+        Returns the sentence about this sentence's cells that are not in
+        other, whose count is the difference of the two counts.
+        """
+        if not self.aligned(other):
+            return MaskSentence(self.cells - other.cells,
+                                self.count - other.count, self.width)
+        base = min(self.base, other.base)
+        mask = (self.mask << (self.base - base)) & ~(other.mask << (other.base - base))
+        return MaskSentence.from_mask(mask, base, self.count - other.count, self.width)
+
+    def known_mines(self):
+        """
+        Returns the set of all cells in self.cells known to be mines.
+        """
+        if self.count == len(self):
+            return self.cells
+        else:
+            return set()
+
+    def discard(self, cell):
+        """
+        Removes a cell, returning whether it was in the sentence.
+        """
+        i, j = cell
+        offset = i * self.width + j - self.base
+        if not 0 <= j < self.width or not 0 <= offset < self.mask.bit_length():
+            return False
+        bit = 1 << offset
+        if not self.mask & bit:
+            return False
+        if offset:
+            self.mask ^= bit
+        else:
+            self.set_mask(self.mask ^ bit, self.base)
+        if self.decoded is not None:
+            self.decoded = self.decoded.difference((cell,))
+        return True
+
+    def mark_mine(self, cell):
+        """
+        Updates internal knowledge representation given the fact that
+        a cell is known to be a mine.
+        """
+        if self.discard(cell):
+            self.count -= 1
+
+    def mark_safe(self, cell):
+        """
+        Updates internal knowledge representation given the fact that
+        a cell is known to be safe.
+        """
+        self.discard(cell)
+
+
+class Knowledge():
+    """
+    Indexed collection of Sentences about a Minesweeper game
+
+    Sentences are indexed by the cells they mention, so marking a cell
+    only visits the sentences containing it, and each sentence's canonical
+    form (frozenset of cells, count) is kept in a set, so duplicates are
+    found without comparing against every sentence. Sentences that become
+    empty or duplicate are removed as soon as a mark makes them so.
+
+    Components, the groups of sentences linked by shared cells, are kept
+    up to date incrementally: a change dissolves only the component it
+    touches, and components() regroups only dissolved and new sentences.
+    Each component has a number that is never reused, so results computed
+    for a component stay valid for as long as its number is current.
+    """
+
+    def __init__(self):
+
+        # Sentences in insertion order, keyed by id()
+        self.sentences = dict()
+
+        # Ids of the sentences mentioning each cell
+        self.by_cell = dict()
+
+        # Canonical form of every sentence held
+        self.canonical = set()
+
+        # Ids of the sentences in each numbered component, the component
+        # of each grouped sentence, and the ids of sentences not yet grouped
+        self.groups = dict()
+        self.group_of = dict()
+        self.ungrouped = set()
+        self.numbers = itertools.count()
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def __iter__(self):
+        return iter(list(self.sentences.values()))
+
+    def __getitem__(self, index):
+        return list(self.sentences.values())[index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __contains__(self, sentence):
+        return sentence.key() in self.canonical
+
+    def add(self, sentence):
+        """
+        Adds a sentence unless it is empty or already known.
+        Returns True if it was added.
+        """
+        key = sentence.key()
+        if not len(sentence) or key in self.canonical:
+            return False
+        self.canonical.add(key)
+        self.sentences[id(sentence)] = sentence
+        self.ungrouped.add(id(sentence))
+        for cell in sentence.cells:
+            self.by_cell.setdefault(cell, set()).add(id(sentence))
+        return True
+
+    def remove(self, sentence):
+        """
+        Removes a sentence, which must not have changed since it was added.
+        """
+        self.dissolve(id(sentence))
+        self.ungrouped.discard(id(sentence))
+        self.canonical.discard(sentence.key())
+        self.sentences.pop(id(sentence))
+        for cell in sentence.cells:
+            self.by_cell[cell].discard(id(sentence))
+
+    def dissolve(self, key):
+        """
+        Ungroups the component of the sentence with id `key`, if any.
+        """
+        number = self.group_of.get(key)
+        if number is None:
+            return
+        for member in self.groups.pop(number):
+            del self.group_of[member]
+            self.ungrouped.add(member)
+
+    def components(self):
+        """
+        Returns a dict from component numbers to the sentences in each
+        component, regrouping the sentences that changed since last time.
+        """
+        while self.ungrouped:
+            # Walk breadth-first, so that neighboring sentences stay close
+            # together, which keeps count_solutions' memo small
+            start = self.ungrouped.pop()
+            members = [start]
+            seen = {start}
+            for key in members:
+                for cell in self.sentences[key].cells:
+                    for other in self.by_cell[cell]:
+                        if other not in seen:
+                            # Reaching a grouped sentence merges its component
+                            self.dissolve(other)
+                            self.ungrouped.discard(other)
+                            seen.add(other)
+                            members.append(other)
+            number = next(self.numbers)
+            self.groups[number] = members
+            for member in members:
+                self.group_of[member] = number
+        return {
+            number: [self.sentences[key] for key in members]
+            for number, members in self.groups.items()
+        }
+
+    def containing(self, cell):
+        """
+        Returns the sentences mentioning a cell.
+        """
+        return [self.sentences[key] for key in self.by_cell.get(cell, ())]
+
+    def holds(self, sentence):
+        """
+        Checks if this very sentence is in the knowledge base.
+        """
+        return self.sentences.get(id(sentence)) is sentence
+
+    def overlapping(self, sentence):
+        """
+        Returns the other sentences sharing at least one cell with sentence.
+        """
+        keys = set().union(*(self.by_cell.get(cell, ()) for cell in sentence.cells))
+        keys.discard(id(sentence))
+        return [self.sentences[key] for key in keys]
+
+    def mark(self, cell, mine):
+        """
+        Marks a cell as a mine, or as safe, in every sentence mentioning
+        it, which takes the cell out of the sentence. Only the cell's own
+        index entry and the canonical forms change, unless a sentence
+        becomes empty or duplicate and goes.
+        Returns the changed sentences that are still held.
+        """
+        changed = []
+        for sentence in self.containing(cell):
+            self.dissolve(id(sentence))
+            self.canonical.discard(sentence.key())
+            self.by_cell[cell].discard(id(sentence))
+            if mine:
+                sentence.mark_mine(cell)
+            else:
+                sentence.mark_safe(cell)
+            key = sentence.key()
+            # Changed sentences move to the end, as if removed and added again
+            del self.sentences[id(sentence)]
+            if not len(sentence) or key in self.canonical:
+                self.ungrouped.discard(id(sentence))
+                for other in sentence.cells:
+                    self.by_cell[other].discard(id(sentence))
+            else:
+                self.canonical.add(key)
+                self.sentences[id(sentence)] = sentence
+                changed.append(sentence)
+        return changed
+
+    def mark_mine(self, cell):
+        """
+        Marks a cell as a mine in every sentence mentioning it.
+        Returns the changed sentences that are still held.
+        """
+        return self.mark(cell, True)
+
+    def mark_safe(self, cell):
+        """
+        Marks a cell as safe in every sentence mentioning it.
+        Returns the changed sentences that are still held.
+        """
+        return self.mark(cell, False)
+
+
+class IndexableSet():
+    """
+    Set of the integers 0 to size - 1, less those discarded, with O(1)
+    membership, random choice and removal
+
+    Works like a lazy Fisher-Yates shuffle: the items sit in a virtual
+    array whose slot n holds n until something moves there, and discarding
+    an item moves the last item into its slot and shrinks the array. Only
+    moved slots and discarded items are stored, so memory grows with the
+    items removed rather than with size.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.items = dict()
+        self.slots = dict()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for slot in range(self.size):
+            yield self.items.get(slot, slot)
+
+    def __contains__(self, item):
+        slot = self.slots.get(item, item)
+        return slot is not None and 0 <= slot < self.size
+
+    def discard(self, item):
+        """
+        Removes an item if it is in the set.
+        """
+        if item not in self:
+            return
+        slot = self.slots.get(item, item)
+        last = self.size - 1
+        moved = self.items.pop(last, last)
+        if slot != last:
+            self.items[slot] = moved
+            self.slots[moved] = slot
+        self.slots[item] = None
+        self.size -= 1
+
+    def choice(self):
+        """
+        Returns a random item.
+        """
+        slot = random.randrange(self.size)
+        return self.items.get(slot, slot)
+
+
+class SolverTimeout(Exception):
+    """Raised when counting a component's solutions runs out of time."""
+
+
+def count_solutions(sentences, deadline=None):
+    """
+    Counts the ways to place mines in the cells of a component so that
+    every sentence holds, by backtracking over the cells one at a time.
+
+    Once a prefix of the cells is assigned, only the mines still owed by
+    the sentences straddling the next cell matter, so the count for the
+    rest of the cells is memoized on those. Returns the list of cells and
+    a dict from each number of mines k to (ways, weights), where ways is
+    the number of solutions with k mines and weights[n] the number of them
+    with a mine in cells[n]. Raises SolverTimeout after `deadline`.
+    """
+    cells = list(dict.fromkeys(
+        cell for sentence in sentences for cell in sorted(sentence.cells)
+    ))
+    position = {cell: n for n, cell in enumerate(cells)}
+    remaining = [sentence.count for sentence in sentences]
+    unassigned = [len(sentence) for sentence in sentences]
+
+    # Sentences containing each cell, and those straddling each position
+    containing = [[] for _ in cells]
+    straddling = [[] for _ in range(len(cells) + 1)]
+    for index, sentence in enumerate(sentences):
+        positions = sorted(position[cell] for cell in sentence.cells)
+        for n in positions:
+            containing[n].append(index)
+        for n in range(positions[0] + 1, positions[-1] + 1):
+            straddling[n].append(index)
+
+    memo = dict()
+
+    def solve(n):
+        if n == len(cells):
+            return {0: (1, [])}
+        key = (n, tuple(remaining[index] for index in straddling[n]))
+        if key in memo:
+            return memo[key]
+        if deadline is not None and time.perf_counter() > deadline:
+            raise SolverTimeout
+
+        result = dict()
+        for value in (0, 1):
+            consistent = True
+            for index in containing[n]:
+                remaining[index] -= value
+                unassigned[index] -= 1
+                if not 0 <= remaining[index] <= unassigned[index]:
+                    consistent = False
+            if consistent:
+                for mines, (ways, weights) in solve(n + 1).items():
+                    total, totals = result.setdefault(mines + value, (0, [0] * (len(cells) - n)))
+                    totals[0] += ways * value
+                    for m, weight in enumerate(weights, 1):
+                        totals[m] += weight
+                    result[mines + value] = (total + ways, totals)
+            for index in containing[n]:
+                remaining[index] += value
+                unassigned[index] += 1
+
+        memo[key] = result
+        return result
+
+    return cells, solve(0)
+
+
+def estimate_solutions(sentences):
+    """
+    Stands in for count_solutions on components too large to count: gives
+    each cell the highest mine density of the sentences containing it, as
+    a single weighted solution with the expected number of mines.
+    """
+    density = dict()
+    for sentence in sentences:
+        for cell in sentence.cells:
+            density[cell] = max(density.get(cell, 0), sentence.count / len(sentence))
+    cells = list(density)
+    return cells, {round(sum(density.values())): (1, [density[cell] for cell in cells])}
+
+
+def convolve(first, second):
+    """
+    Returns the distribution of total mines of two independent
+    distributions, each a dict from mines to ways.
+    """
+    result = dict()
+    for a, x in first.items():
+        for b, y in second.items():
+            result[a + b] = result.get(a + b, 0) + x * y
+    return result
+
+
 class MinesweeperAI():
     """
     Minesweeper game player
+
+    In sparse mode, for huge boards, nothing is kept per cell of the board:
+    the cells not yet chosen or known to be mines are an IndexableSet of
+    cell numbers, updated as moves are made, and guesses only look at the
+    frontier and draw interior cells from that set. With `bitmask`, the
+    AI's sentences are MaskSentences.
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, total_mines=None, sparse=False,
+                 bitmask=False):
 
         # Set initial height and width
         self.height = height
         self.width = width
 
+        # Number of mines on the board, if the AI is told
+        self.total_mines = total_mines
+
         # Keep track of which cells have been clicked on
         self.moves_made = set()
 
@@ -155,29 +748,45 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Safe cells not yet chosen, kept up to date as cells are marked
+        self.safe_moves = set()
+
+        # Sentences about the game known to be true
+        self.knowledge = Knowledge()
+        self.bitmask = bitmask
+
+        # Seconds add_knowledge spent on each move
+        self.inference_times = []
+
+        # count_solutions results of unchanged components, by component number
+        self.solutions = dict()
+
+        # Numbers i * width + j of the cells not chosen or known to be mines
+        self.unknown = IndexableSet(height * width)
 
-        # LOOK Added For convenience, a set of ALL cells, no matter what the state
-        self.total = {(x, y) for x in range(self.height) for y in range(self.width)}
+        # Whether to guess without listing every cell of the board
+        self.sparse = sparse
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
+        Returns the sentences that changed.
         """
         self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        self.unknown.discard(cell[0] * self.width + cell[1])
+        return self.knowledge.mark_mine(cell)
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
+        Returns the sentences that changed.
         """
         self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        if cell not in self.moves_made:
+            self.safe_moves.add(cell)
+        return self.knowledge.mark_safe(cell)
 
     def add_knowledge(self, cell, count):
         """
@@ -194,11 +803,15 @@ class MinesweeperAI():
             5) add any new sentences to the AI's knowledge base
                if they can be inferred from existing knowledge
         """
+        start = time.perf_counter()
+
         # 1) mark the cell as a move that has been made
         self.moves_made.add(cell)
+        self.safe_moves.discard(cell)
+        self.unknown.discard(cell[0] * self.width + cell[1])
 
         # 2) mark the cell as safe
-        self.mark_safe(cell)
+        changed = self.mark_safe(cell)
 
         # 3) add a new sentence to the AI's knowledge base
         #    based on the value of `cell` and `count`
@@ -222,69 +835,55 @@ class MinesweeperAI():
                 if 0 <= row < self.height and 0 <= col < self.width:
                     cells.add((row, col))
 
-        #cells = cells - self.safes
-        #cells = cells - self.mines
-        sentence = Sentence(cells, count)
-        self.knowledge.append(sentence)
-        #self.print_debug(cell, count)
-
-        # 4) mark any additional cells as safe or as mines
-        #    if it can be concluded based on the AI's knowledge base
-
-        # Now update self.safes, self.mines with any new knowledge.
-        self.update_safes_n_mines()
-
-        # Remove depricated empty sentence objects 
-        empty_sentence = Sentence(set(), 0)
-        self.knowledge = [sentence for sentence in self.knowledge if sentence != empty_sentence]
-
-        # 5) add any new sentences to the AI's knowledge base
-        #    if they can be inferred from existing knowledge
-
-        # Normalize the knowledge base (KB) by consolidating knowledge 
-        # into fewer sentences (aka Elimination)
-        for sentence1 in self.knowledge:
-            # Looping through sentences - looking for possible subset
-            for sentence2 in self.knowledge:
-                # Ignore your EXACT self
-                if sentence1 is sentence2:
-                    continue
-
-                #  Eliminate duplicates (differect sentences, same content)
-                if sentence1 == sentence2:
-                    self.knowledge.remove(sentence2)
-
-                # If found subset, inference by resolution
-                #if sentence1.cells.issubset(sentence2.cells):
-                if sentence1.cells <= sentence2.cells:
-                    # Remove the same cells from superset
-                    result_set = sentence2.cells - sentence1.cells
-                    # Subtract amount of mines
-                    result_count = sentence2.count - sentence1.count
-                    # Create new sentence
-                    new_knowledge = Sentence(result_set, result_count)
-                    # And add to the knowledge list only when it is new knowledge
-                    if new_knowledge not in self.knowledge:
-                        self.knowledge.append(new_knowledge)
+        if self.bitmask:
+            sentence = MaskSentence(cells, count, self.width)
+        else:
+            sentence = Sentence(cells, count)
+        if self.knowledge.add(sentence):
+            changed.append(sentence)
 
-        # Now update (again) self.safes, self.mines with any new knowledge.
-        self.update_safes_n_mines()
-        #self.print_debug(cell, count)
+        # 4) and 5) infer safes, mines and new sentences from the
+        #    sentences that are new or changed
+        self.infer(changed)
+        self.inference_times.append(time.perf_counter() - start)
 
+    def infer(self, sentences):
+        """
+        Draws every conclusion that follows from new or changed sentences.
 
-    def update_safes_n_mines(self):
-        """ Update the top level safes and mines sets 
-            using the latest knowledge
+        Sentences wait on a worklist. One taken from it either marks its
+        cells as safes or mines, which queues the sentences that marking
+        changes, or is compared with the sentences sharing a cell with it,
+        queuing the difference wherever one's cells are a subset of the
+        other's. Inference stops at a fixpoint, once no new safes, mines or
+        sentences appear.
         """
-        for sentence in self.knowledge:
-            mines = sentence.known_mines()
-            for c in mines.copy():
-                self.mark_mine(c)
+        worklist = collections.deque(sentences)
+        while worklist:
+            sentence = worklist.popleft()
+            if not self.knowledge.holds(sentence):
+                continue
 
-            safes = sentence.known_safes()
-            for c in safes.copy():
-                self.mark_safe(c)
+            # Mark cells the sentence decides, queueing what that changes
+            mines = sentence.known_mines().copy()
+            safes = sentence.known_safes().copy()
+            if mines or safes:
+                for cell in mines:
+                    worklist.extend(self.mark_mine(cell))
+                for cell in safes:
+                    worklist.extend(self.mark_safe(cell))
+                continue
 
+            # Infer by subset, against sentences sharing a cell only
+            for other in self.knowledge.overlapping(sentence):
+                if other.issubset(sentence):
+                    inferred = sentence.difference(other)
+                elif sentence.issubset(other):
+                    inferred = other.difference(sentence)
+                else:
+                    continue
+                if self.knowledge.add(inferred):
+                    worklist.append(inferred)
 
     def print_debug(self, cell, count):
 
@@ -307,21 +906,157 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
-        safe_cells = self.safes - self.moves_made - self.mines
-        if len(safe_cells) > 0:
-            return safe_cells.pop()
-        else:
-            return None
+        for cell in self.safe_moves:
+            return cell
+        return None
 
-    def make_random_move(self):
+    def make_random_move(self, time_limit=PROBABILITY_TIME_LIMIT):
         """
         Returns a move to make on the Minesweeper board.
         Should choose randomly among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+        Chooses among the cells least likely to be mines, as computed by
+        mine_probabilities within time_limit.
         """
-        random_cells = self.total - self.moves_made - self.mines
-        if len(random_cells) > 0:
-            return random.choice(tuple(random_cells))
-        else:
+        if self.sparse:
+            return self.make_sparse_random_move(time_limit)
+        probabilities = self.mine_probabilities(time_limit)
+        if not probabilities:
             return None
+        lowest = min(probabilities.values())
+        return random.choice(sorted(
+            cell for cell, probability in probabilities.items()
+            if probability <= lowest + 1e-9
+        ))
+
+    def make_sparse_random_move(self, time_limit=PROBABILITY_TIME_LIMIT):
+        """
+        Chooses like make_random_move, without listing the interior cells:
+        when they are among the least likely to be mines, an interior cell
+        is drawn at random from self.unknown, skipping frontier cells.
+        """
+        probabilities, density, interior = self.frontier_probabilities(time_limit)
+        if not probabilities and not interior:
+            return None
+        lowest = min(probabilities.values(), default=1.0)
+        if interior and density < lowest - 1e-9:
+            lowest = density
+        tied = sorted(
+            cell for cell, probability in probabilities.items()
+            if probability <= lowest + 1e-9
+        )
+        if interior and density <= lowest + 1e-9:
+            if random.randrange(interior + len(tied)) < interior:
+                while True:
+                    cell = divmod(self.unknown.choice(), self.width)
+                    if cell not in probabilities:
+                        return cell
+        return random.choice(tied)
+
+    def mine_probabilities(self, time_limit=PROBABILITY_TIME_LIMIT):
+        """
+        Returns a dict from every cell not yet chosen or known to be a mine
+        to the probability that it is a mine. The interior cells are listed
+        from self.unknown, so this works in sparse mode too, though it takes
+        time and memory in proportion to the board.
+        """
+        probabilities, density, interior = self.frontier_probabilities(time_limit)
+        if interior:
+            for number in self.unknown:
+                probabilities.setdefault(divmod(number, self.width), density)
+        return probabilities
+
+    def frontier_probabilities(self, time_limit=PROBABILITY_TIME_LIMIT):
+        """
+        Returns a dict from every cell on the frontier, or known safe and
+        not yet chosen, to the probability that it is a mine, along with
+        the probability for each interior cell, which no sentence mentions,
+        and the number of interior cells.
+
+        Each component of the frontier is solved exactly by
+        count_solutions, and the components are combined with the interior
+        by weighting every total number of frontier mines K by the ways to
+        place the other total_mines - K mines among the interior cells.
+        Components too large or too slow to count within time_limit are
+        estimated instead; a time_limit of None counts every component of
+        at most MAX_COMPONENT_CELLS cells exactly, so the result does not
+        depend on how fast the machine is. Exact counts are kept in self.solutions for as
+        long as their component is unchanged. Without total_mines, frontier
+        solutions are weighted equally and interior cells get the mean
+        frontier probability.
+        """
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        solved = []
+        solutions = dict()
+        for number, component in self.knowledge.components().items():
+            if number in self.solutions:
+                solutions[number] = self.solutions[number]
+                solved.append(solutions[number])
+                continue
+            try:
+                if sum(len(sentence) for sentence in component) > MAX_COMPONENT_CELLS:
+                    raise SolverTimeout
+                solutions[number] = count_solutions(component, deadline)
+                solved.append(solutions[number])
+            except SolverTimeout:
+                solved.append(estimate_solutions(component))
+        self.solutions = solutions
+
+        frontier = {cell for cells, _ in solved for cell in cells}
+        safes = self.safe_moves
+        interior = len(self.unknown) - len(frontier) - len(safes)
+        if self.total_mines is None:
+            left = None
+        else:
+            left = self.total_mines - len(self.mines)
+
+        def weight(mines):
+            """Ways to place the mines left over in the interior."""
+            if left is None:
+                return 1
+            if 0 <= left - mines <= interior:
+                return math.comb(interior, left - mines)
+            return 0
+
+        # Mines-to-ways distributions before and after each component
+        distributions = [
+            {mines: ways for mines, (ways, _) in counts.items()}
+            for _, counts in solved
+        ]
+        before = [{0: 1}]
+        for distribution in distributions:
+            before.append(convolve(before[-1], distribution))
+        after = [{0: 1}]
+        for distribution in reversed(distributions):
+            after.append(convolve(after[-1], distribution))
+        after.reverse()
+
+        everything = before[-1]
+        total = sum(ways * weight(mines) for mines, ways in everything.items())
+        if not total:
+            # The mine count contradicts the sentences: ignore it
+            left = None
+            total = sum(everything.values())
+
+        probabilities = {cell: 0.0 for cell in frontier | safes}
+        for n, (cells, counts) in enumerate(solved):
+            others = convolve(before[n], after[n + 1])
+            for mines, (_, weights) in counts.items():
+                factor = sum(ways * weight(mines + more) for more, ways in others.items())
+                for cell, cell_weight in zip(cells, weights):
+                    probabilities[cell] += cell_weight * factor / total
+
+        density = 0.0
+        if interior:
+            if left is None:
+                if frontier:
+                    density = sum(probabilities[cell] for cell in frontier) / len(frontier)
+                else:
+                    density = 0.5
+            else:
+                density = sum(
+                    ways * weight(mines) * (left - mines)
+                    for mines, ways in everything.items()
+                ) / total / interior
+        return probabilities, density, interior
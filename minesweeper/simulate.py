@@ -0,0 +1,191 @@
+"""
+Headless Minesweeper simulation: MinesweeperAI plays seeded games spread
+over a process pool, without pygame.
+
+Prints the win rate, moves per game and per-move latency (choosing the
+move and updating knowledge), and writes every game's result as JSON,
+including the seeds of lost games. A lost game is replayed move by move
+with --replay SEED.
+
+Usage: python simulate.py [-n GAMES] [--height H --width W]
+                          [--density D | --mines M] [--workers W]
+                          [--numpy] [--flood] [--sparse] [--bitmask]
+                          [--seed S] [--output FILE] [--replay SEED]
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import itertools
+import json
+import math
+import random
+import statistics
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI, NumpyMinesweeper
+
+
+def play_game(height, width, mines, seed, verbose=False, numpy=False, flood=False,
+              sparse=False, bitmask=False):
+    """
+    Plays one game with the given seed and returns whether the AI won, the
+    number of moves it made, the seconds each move took and the seconds
+    each add_knowledge() spent inferring.
+
+    With `numpy` the game is a NumpyMinesweeper, and with `flood` each move
+    also reveals the cells flood-filled from it. `sparse` and `bitmask`
+    put the AI in those modes. Guesses are computed without a deadline, so
+    the game replays move for move from its seed however loaded the
+    machine is.
+    """
+    random.seed(seed)
+    board = NumpyMinesweeper if numpy else Minesweeper
+    game = board(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, total_mines=mines,
+                       sparse=sparse, bitmask=bitmask)
+    latencies = []
+    won = False
+    while True:
+        start = time.perf_counter()
+        move = ai.make_safe_move()
+        kind = "safe"
+        if move is None:
+            move = ai.make_random_move(time_limit=None)
+            kind = "guess"
+        if move is None:
+            won = True
+            break
+        if game.is_mine(move):
+            latencies.append(time.perf_counter() - start)
+            if verbose:
+                print(f"{len(latencies):>4} {kind:>5} {move} hit a mine")
+            break
+        if flood:
+            revealed = game.reveal(move, ai.moves_made)
+        else:
+            revealed = {move: game.nearby_mines(move)}
+        for cell, nearby in revealed.items():
+            ai.add_knowledge(cell, nearby)
+        latencies.append(time.perf_counter() - start)
+        if verbose:
+            print(f"{len(latencies):>4} {kind:>5} {move} {revealed[move]} nearby, "
+                  f"{len(revealed)} revealed, {latencies[-1] * 1000:.2f} ms")
+        if len(ai.moves_made) == height * width - mines:
+            won = True
+            break
+
+    if verbose:
+        game.print()
+        print("Won" if won else "Lost")
+    return {
+        "seed": seed,
+        "won": won,
+        "moves": len(latencies),
+        "latencies": latencies,
+        "inference": ai.inference_times,
+    }
+
+
+def percentile(values, fraction):
+    """
+    Returns the nearest-rank percentile of a non-empty list of values.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(games):
+    """
+    Returns the win rate, mean moves per game, and mean and p99 move
+    latency in seconds over all games.
+    """
+    latencies = [latency for game in games for latency in game["latencies"]]
+    return {
+        "games": len(games),
+        "win": sum(game["won"] for game in games) / len(games),
+        "moves_per_game": statistics.fmean(game["moves"] for game in games),
+        "mean_latency": statistics.fmean(latencies) if latencies else 0.0,
+        "p99_latency": percentile(latencies, 0.99) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate MinesweeperAI games.")
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("--height", type=int, default=8)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--density", type=float, default=None,
+                        help="fraction of cells that are mines")
+    parser.add_argument("--mines", type=int, default=None,
+                        help="number of mines, instead of --density")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes to play games in")
+    parser.add_argument("--numpy", action="store_true",
+                        help="play on NumPy boards, for large boards")
+    parser.add_argument("--flood", action="store_true",
+                        help="reveal the flood fill around cells with no nearby mines")
+    parser.add_argument("--sparse", action="store_true",
+                        help="run the AI in sparse mode, for huge boards")
+    parser.add_argument("--bitmask", action="store_true",
+                        help="store the AI's sentences as bitmasks")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first game; game n uses seed + n")
+    parser.add_argument("--output", default="simulation.json",
+                        help="file to write JSON results to")
+    parser.add_argument("--replay", type=int, default=None, metavar="SEED",
+                        help="replay the game with this seed, move by move")
+    args = parser.parse_args()
+
+    if args.mines is not None and args.density is not None:
+        parser.error("give either --mines or --density")
+    if args.mines is not None:
+        mines = args.mines
+    else:
+        density = 0.125 if args.density is None else args.density
+        mines = round(density * args.height * args.width)
+    if not 0 <= mines < args.height * args.width:
+        parser.error("need fewer mines than cells")
+
+    if args.replay is not None:
+        play_game(args.height, args.width, mines, args.replay, verbose=True,
+                  numpy=args.numpy, flood=args.flood, sparse=args.sparse,
+                  bitmask=args.bitmask)
+        return
+
+    seeds = [args.seed + n for n in range(args.games)]
+    with concurrent.futures.ProcessPoolExecutor(args.workers) as pool:
+        games = list(pool.map(
+            play_game, itertools.repeat(args.height), itertools.repeat(args.width),
+            itertools.repeat(mines), seeds, itertools.repeat(False),
+            itertools.repeat(args.numpy), itertools.repeat(args.flood),
+            itertools.repeat(args.sparse), itertools.repeat(args.bitmask),
+            chunksize=max(1, args.games // 64)
+        ))
+
+    summary = summarize(games)
+    lost = [game["seed"] for game in games if not game["won"]]
+    print(f"{args.height}x{args.width} with {mines} mines, {len(games)} games")
+    print(f"win rate {summary['win']:.1%}, {summary['moves_per_game']:.1f} moves per game, "
+          f"latency mean {summary['mean_latency'] * 1000:.2f} ms "
+          f"p99 {summary['p99_latency'] * 1000:.2f} ms")
+    if lost:
+        flags = "".join(f" --{flag}" for flag in ["numpy", "flood", "sparse", "bitmask"]
+                        if getattr(args, flag))
+        print(f"Replay a lost game with: python simulate.py --height {args.height} "
+              f"--width {args.width} --mines {mines}{flags} --replay {lost[0]}")
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "config": vars(args),
+            "mines": mines,
+            "summary": summary,
+            "lost": lost,
+            "games": games,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import pytest
+from logic import *
+
+A = Symbol("A")
+B = Symbol("B")
+C = Symbol("C")
+
+# Knowledge base from harry.py: Harry visited Dumbledore, so it rained
+rain = Symbol("rain")
+hagrid = Symbol("hagrid")
+dumbledore = Symbol("dumbledore")
+harry = And(
+    Implication(Not(rain), hagrid),
+    Or(hagrid, dumbledore),
+    Not(And(hagrid, dumbledore)),
+    dumbledore
+)
+
+# Backend Tests
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    return request.param
+
+def test_model_check_backends_agree_on_harry(backend):
+    assert model_check(harry, rain, backend=backend)
+    assert model_check(harry, Not(hagrid), backend=backend)
+    assert not model_check(harry, hagrid, backend=backend)
+
+def test_model_check_biconditional(backend):
+    knowledge = And(Biconditional(A, Or(B, C)), Not(B), A)
+    assert model_check(knowledge, C, backend=backend)
+    assert not model_check(And(Biconditional(A, B)), A, backend=backend)
+
+def test_inconsistent_knowledge_entails_everything(backend):
+    assert model_check(And(A, Not(A), B), C, backend=backend)
+
+def test_parallel_backend_across_prefixes(monkeypatch):
+    import logic
+    monkeypatch.setattr(logic, "PARALLEL_MIN_SYMBOLS", 0)
+    chain = [Symbol(f"P{i}") for i in range(8)]
+    knowledge = And(chain[0], *[Implication(p, q) for p, q in zip(chain, chain[1:])])
+    assert model_check_parallel(knowledge, chain[-1], workers=2, prefix_bits=3)
+    assert not model_check_parallel(knowledge, Not(chain[-1]), workers=2, prefix_bits=3)
+    assert model_check_parallel(harry, rain, workers=2, prefix_bits=5)
+
+def test_numpy_backend_across_chunks(monkeypatch):
+    pytest.importorskip("numpy")
+    import logic
+    monkeypatch.setattr(logic, "NUMPY_CHUNK_BITS", 2)
+    symbols = [Symbol(f"P{i}") for i in range(8)]
+    knowledge = And(*[Implication(symbols[i], symbols[i + 1]) for i in range(7)], symbols[0])
+    assert model_check(knowledge, symbols[7], backend="numpy")
+    assert not model_check(knowledge, Not(symbols[7]), backend="numpy")
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        model_check(A, A, backend="nosuchbackend")
+
+# DPLL Tests
+
+def test_satisfiable_returns_model():
+    knowledge = And(Or(A, B), Implication(A, C), Not(C))
+    model = satisfiable(knowledge)
+    assert model == {"A": False, "B": True, "C": False}
+    assert knowledge.evaluate(model)
+
+def test_unsatisfiable_returns_none():
+    assert satisfiable(And(Or(A, B), Not(A), Not(B))) is None
+
+def test_cnf_reuses_subsentence_literals():
+    shared = And(A, B)
+    cnf = CNF()
+    assert cnf.literal(shared) == cnf.literal(shared)
+    assert set(cnf.variables) == {"A", "B"}
+
+# Compiled Evaluator Tests
+
+def test_compiled_evaluator_matches_evaluate():
+    sentence = And(Implication(A, B), Biconditional(B, Not(C)), Or(A, C))
+    names = ("A", "B", "C")
+    tuple_evaluator = compile_evaluator(sentence, names)
+    bitmask_evaluator = compile_evaluator(sentence, names, bitmask=True)
+    for mask in range(8):
+        values = tuple(bool(mask >> i & 1) for i in range(3))
+        expected = sentence.evaluate(dict(zip(names, values)))
+        assert bool(tuple_evaluator(values)) == expected
+        assert bool(bitmask_evaluator(mask)) == expected
+
+def test_compiled_evaluator_is_cached():
+    assert compile_evaluator(And(A, B), ("A", "B")) is compile_evaluator(And(A, B), ("A", "B"))
+
+def test_empty_sentences_compile():
+    assert compile_evaluator(And(), ())(()) is True
+    assert compile_evaluator(Or(), ())(()) is False
+
+# Partial Evaluation Tests
+
+def test_partial_evaluation_is_three_valued():
+    assert And(A, B).partial({"A": False}) is False
+    assert And(A, B).partial({"A": True}) is None
+    assert Or(A, B).partial({"B": True}) is True
+    assert Implication(A, B).partial({"A": False}) is True
+    assert Implication(A, B).partial({"B": True}) is True
+    assert Implication(A, B).partial({"A": True}) is None
+    assert Biconditional(A, B).partial({"A": True}) is None
+    assert Biconditional(A, Not(B)).partial({"A": True, "B": True}) is False
+
+def test_pruning_visits_fewer_leaves():
+    knowledge = And(Not(A), Or(B, C), Implication(B, C))
+    pruned = {}
+    full = {}
+    assert model_check_prune(knowledge, C, stats=pruned)
+    assert model_check_enumerate(knowledge, C, stats=full)
+    assert full["leaves"] == 8
+    assert pruned["leaves"] < full["leaves"]
+
+# Batch Entailment Tests
+
+def test_entailed_answers_every_query():
+    answers = entailed(harry, [rain, hagrid, dumbledore, Not(hagrid), Or(rain, hagrid), Symbol("snow")])
+    assert answers[rain] == YES
+    assert answers[hagrid] == NO
+    assert answers[dumbledore] == YES
+    assert answers[Not(hagrid)] == YES
+    assert answers[Or(rain, hagrid)] == YES
+    assert answers[Symbol("snow")] == MAYBE
+
+def test_entailed_agrees_with_model_check():
+    knowledge = And(Or(A, B), Implication(A, C))
+    queries = [A, B, C, Not(A), Implication(Not(B), C), And(A, B)]
+    answers = entailed(knowledge, queries)
+    for query in queries:
+        if answers[query] == YES:
+            assert model_check(knowledge, query)
+        elif answers[query] == NO:
+            assert model_check(knowledge, Not(query))
+        else:
+            assert not model_check(knowledge, query) and not model_check(knowledge, Not(query))
+
+# Model Enumeration Tests
+
+def test_models_of_harry():
+    assert list(models(harry)) == [{"rain": True, "hagrid": False, "dumbledore": True}]
+
+def test_models_are_lazy_and_complete():
+    assert len(list(models(Or(A, B)))) == 3
+    assert len(list(models(Or(A, B), symbols=["C"]))) == 6
+    assert list(models(And(A, Not(A)))) == []
+    many = Or(*[Symbol(f"P{i}") for i in range(60)])
+    assert many.evaluate(next(models(many)))
+
+def test_model_count():
+    assert model_count(harry) == 1
+    assert model_count(Or(A, B)) == 3
+    assert model_count(Or(A, B), symbols=["C"]) == 6
+    assert model_count(And(A, Not(A))) == 0
+    assert model_count(Or(*[Symbol(f"P{i}") for i in range(60)])) == 2 ** 60 - 1
+
+def test_model_count_splits_components():
+    chain = And(*[Or(Symbol(f"P{i}"), Symbol(f"P{i + 1}")) for i in range(10)])
+    independent = And(chain, Or(A, B))
+    assert model_count(independent) == model_count(chain) * 3
+    assert model_count(chain) == len(list(models(chain)))
+
+# Parser Tests
+
+def test_parse_round_trips_formula():
+    sentences = [
+        harry,
+        And(Or(A, B), Or(A, B, C), Not(And(A, Not(C)))),
+        Implication(Implication(A, B), C),
+        Implication(A, Implication(B, C)),
+        Biconditional(Not(Biconditional(A, B)), Or(C, And(A, B))),
+        And(Symbol("A is a Knight"), Not(Symbol("A is a Knave"))),
+    ]
+    for sentence in sentences:
+        assert parse(sentence.formula()) == sentence
+
+def test_parse_ascii_and_precedence():
+    assert parse("~A & B | C -> A <-> !B") == Biconditional(
+        Implication(Or(And(Not(A), B), C), A), Not(B))
+    assert parse("A => B => C") == Implication(A, Implication(B, C))
+    assert parse("A & (B & C)") == And(A, And(B, C))
+
+@pytest.mark.parametrize("text", ["", "A &", "(A", "A)", "A => => B", "A = B"])
+def test_parse_rejects_malformed(text):
+    with pytest.raises(ParseException):
+        parse(text)
+
+def test_load_knowledge(tmp_path):
+    path = tmp_path / "harry.txt"
+    path.write_text("# Harry visited Dumbledore\n"
+                    + "\n".join(conjunct.formula() for conjunct in harry.conjuncts)
+                    + "\n\n", encoding="utf-8")
+    knowledge = load_knowledge(path)
+    assert knowledge == harry
+    assert model_check(knowledge, rain)
+
+# Frozen Sentence Tests
+
+def test_freeze_shares_equal_subsentences():
+    frozen = freeze(And(Or(A, B), Not(C), Or(A, B)))
+    assert frozen.conjuncts[0] is frozen.conjuncts[2]
+    assert frozen is freeze(And(Or(A, B), Not(C), Or(A, B)))
+    assert frozen == And(Or(A, B), Not(C), Or(A, B))
+    assert hash(frozen) == hash(And(Or(A, B), Not(C), Or(A, B)))
+    assert frozen.symbols() == {"A", "B", "C"}
+
+def test_frozen_sentences_are_immutable():
+    knowledge = And(A)
+    knowledge.add(B)
+    frozen = freeze(knowledge)
+    with pytest.raises(TypeError):
+        frozen.add(C)
+    with pytest.raises(AttributeError):
+        frozen.conjuncts = ()
+    knowledge.add(C)
+    assert frozen.symbols() == {"A", "B"}
+
+def test_frozen_sentences_pickle():
+    import pickle
+    frozen = freeze(harry)
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert model_check(pickle.loads(pickle.dumps(frozen)), rain)
+
+# BDD Tests
+
+def test_bdd_counts_models():
+    assert BDD(Or(A, B)).count() == 3
+    assert BDD(And(A, Not(A))).count() == 0
+    assert BDD(Biconditional(A, Or(B, C))).count() == 4
+
+def test_bdd_forced_symbols():
+    assert BDD(harry).forced() == {"rain": True, "hagrid": False, "dumbledore": True}
+    assert BDD(Or(A, B)).forced() == {}
+
+def test_bdd_shares_equal_functions():
+    bdd = BDD(And(A, B))
+    assert bdd.compile(And(B, A)) == bdd.root
+    assert bdd.compile(Not(Or(Not(A), Not(B)))) == bdd.root
+
+@pytest.mark.parametrize("order", ["appearance", "occurrence", "name"])
+def test_bdd_variable_orders(order):
+    knowledge = And(Or(A, B), Implication(B, C), Not(C))
+    bdd = BDD(knowledge, order)
+    assert sorted(bdd.names) == ["A", "B", "C"]
+    assert bdd.entails(A) and bdd.count() == 1
+    with pytest.raises(ValueError):
+        BDD(knowledge, "random")
+
+# Resolution Tests
+
+def test_prove_by_resolution():
+    assert prove(harry, rain) is True
+    assert prove(harry, Not(hagrid)) is True
+    assert prove(harry, hagrid) is False
+    assert prove(And(Implication(A, B), Implication(B, C)), Implication(A, C)) is True
+
+def test_prove_budget_and_statistics():
+    knowledge = And(*[Implication(Symbol(f"P{i}"), Symbol(f"P{i + 1}")) for i in range(20)],
+                    Symbol("P0"))
+    assert prove(knowledge, Symbol("P20"), steps=5) is None
+    stats = {}
+    assert prove(knowledge, Symbol("P20"), stats=stats) is True
+    assert stats["given"] > 5
+    assert set(stats) == {"given", "resolvents", "tautologies", "subsumed", "clauses", "seconds"}
+
+def test_clause_store_subsumption():
+    store = ClauseStore()
+    store.add(frozenset([1, 2]))
+    store.add(frozenset([1, 2, 3]))
+    assert store.subsumes(frozenset([1, 2, -4]))
+    assert not store.subsumes(frozenset([1, 3]))
+    assert store.subsumed_by(frozenset([1])) == {frozenset([1, 2]), frozenset([1, 2, 3])}
+
+if __name__ == "__main__":
+    pytest.main()
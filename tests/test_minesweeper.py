@@ -7,7 +7,8 @@
 #sys.path.append('../minesweeper')
 
 import pytest
-from minesweeper import Minesweeper, Sentence, MinesweeperAI 
+from minesweeper import Minesweeper, NumpyMinesweeper, Sentence, MaskSentence, MinesweeperAI, Knowledge, IndexableSet, count_solutions
+from simulate import play_game, summarize
 
 # Minesweeper Class Tests
 
@@ -42,6 +43,28 @@ def test_minesweeper_nearby_mines():
     assert game.nearby_mines((1, 2)) == 2  # Cell near both mines
     assert game.nearby_mines((3, 3)) == 1  # Another corner cell
 
+def test_minesweeper_reveal_flood_fills_from_zero_cells():
+    game = Minesweeper(height=4, width=4, mines=0)
+    game.board[3][3] = True
+    game.mines = {(3, 3)}
+    revealed = game.reveal((0, 0))
+    assert len(revealed) == 15 and (3, 3) not in revealed
+    assert revealed[(2, 2)] == 1 and revealed[(0, 0)] == 0
+    assert game.reveal((2, 3)) == {(2, 3): 1}
+    assert set(game.reveal((0, 0), revealed={(0, 1), (1, 0), (1, 1)})) == {(0, 0)}
+
+def test_numpy_minesweeper_matches_list_board():
+    pytest.importorskip("numpy")
+    game = NumpyMinesweeper(height=9, width=13, mines=30)
+    assert len(game.mines) == 30 and int(game.board.sum()) == 30
+    board = Minesweeper(height=9, width=13, mines=0)
+    for i, j in game.mines:
+        board.board[i][j] = True
+    for i in range(9):
+        for j in range(13):
+            assert game.is_mine((i, j)) == board.is_mine((i, j))
+            assert game.nearby_mines((i, j)) == board.nearby_mines((i, j))
+
 def test_minesweeper_won():
     game = Minesweeper(height=3, width=3, mines=2)
     game.mines_found = {(0, 1), (2, 2)}  # Assume these are the actual mine locations
@@ -80,6 +103,98 @@ def test_sentence_mark_mine_and_safe():
     assert s.cells == {(2, 2)}
     assert s.count == 1
 
+def test_mask_sentences():
+    small = MaskSentence({(1, 1), (2, 0)}, 1, width=3)
+    large = MaskSentence({(1, 1), (1, 2), (2, 0)}, 2, width=3)
+    assert (small.base, small.mask) == (4, 0b101)
+    assert len(large) == 3
+    assert small.issubset(large) and not large.issubset(small)
+    assert large.difference(small) == Sentence({(1, 2)}, 1)
+    assert MaskSentence({(0, 0)}, 1, width=3).issubset(MaskSentence({(0, 0), (9, 2)}, 1, width=3))
+    assert not MaskSentence({(0, 1)}, 1, width=3).issubset(large)
+    large.mark_mine((1, 1))
+    assert large == MaskSentence({(1, 2), (2, 0)}, 1, width=3)
+
+def test_mask_sentences_of_other_widths_compare_cells():
+    narrow = MaskSentence({(1, 0)}, 1, width=1)
+    wide = MaskSentence({(0, 1)}, 1, width=2)
+    assert not narrow.issubset(wide) and not wide.issubset(narrow)
+    assert narrow.difference(wide).cells == {(1, 0)}
+    assert narrow != wide
+    assert narrow.issubset(Sentence({(1, 0), (0, 1)}, 1))
+    assert MaskSentence({(1, 0)}, 1, width=4) == Sentence({(1, 0)}, 1)
+
+def test_minesweeperai_bitmask_mode_infers_the_same():
+    for bitmask in (False, True):
+        ai = MinesweeperAI(height=2, width=3, bitmask=bitmask)
+        ai.add_knowledge((0, 0), 1)
+        ai.add_knowledge((0, 1), 1)
+        assert {(0, 2), (1, 2)} <= ai.safes
+        assert all(isinstance(sentence, MaskSentence) == bitmask for sentence in ai.knowledge)
+
+# Knowledge Class Tests
+
+def test_knowledge_ignores_duplicates_and_empties():
+    knowledge = Knowledge()
+    assert knowledge.add(Sentence({(0, 0), (0, 1)}, 1))
+    assert not knowledge.add(Sentence({(0, 1), (0, 0)}, 1))
+    assert not knowledge.add(Sentence(set(), 0))
+    assert len(knowledge) == 1
+    assert Sentence({(0, 0), (0, 1)}, 1) in knowledge
+
+def test_knowledge_marks_only_indexed_sentences():
+    knowledge = Knowledge()
+    s1 = Sentence({(0, 0), (0, 1)}, 1)
+    s2 = Sentence({(0, 1), (0, 2)}, 1)
+    s3 = Sentence({(5, 5), (5, 6)}, 1)
+    for sentence in (s1, s2, s3):
+        knowledge.add(sentence)
+    knowledge.mark_mine((0, 1))
+    assert s1.cells == {(0, 0)} and s1.count == 0
+    assert s2.cells == {(0, 2)} and s2.count == 0
+    assert s3.cells == {(5, 5), (5, 6)} and s3.count == 1
+    knowledge.mark_safe((0, 0))
+    assert list(knowledge) == [s3, s2]
+    assert knowledge.containing((0, 0)) == []
+
+def test_knowledge_drops_sentences_made_duplicate():
+    knowledge = Knowledge()
+    knowledge.add(Sentence({(0, 0), (0, 1)}, 1))
+    knowledge.add(Sentence({(0, 0), (0, 1), (0, 2)}, 1))
+    knowledge.mark_safe((0, 2))
+    assert knowledge == [Sentence({(0, 0), (0, 1)}, 1)]
+
+def test_knowledge_overlapping():
+    knowledge = Knowledge()
+    small = Sentence({(0, 0)}, 1)
+    large = Sentence({(0, 0), (0, 1)}, 1)
+    other = Sentence({(0, 1), (0, 2)}, 1)
+    apart = Sentence({(3, 3)}, 0)
+    for sentence in (small, large, other, apart):
+        knowledge.add(sentence)
+    assert knowledge.overlapping(small) == [large]
+    assert sorted(map(str, knowledge.overlapping(large))) == sorted(map(str, [small, other]))
+    assert knowledge.overlapping(apart) == []
+
+def test_knowledge_components_regroup_only_changes():
+    knowledge = Knowledge()
+    left = Sentence({(0, 0), (0, 1)}, 1)
+    right = Sentence({(0, 5), (0, 6)}, 1)
+    knowledge.add(left)
+    knowledge.add(right)
+    components = knowledge.components()
+    assert sorted(map(len, components.values())) == [1, 1]
+    bridge = Sentence({(0, 1), (0, 2)}, 1)
+    knowledge.add(bridge)
+    regrouped = knowledge.components()
+    right_number = next(n for n, c in components.items() if c == [right])
+    assert regrouped[right_number] == [right]
+    assert sorted(map(len, regrouped.values())) == [1, 2]
+    knowledge.mark_safe((0, 1))
+    split = knowledge.components()
+    assert right_number in split
+    assert sorted(map(len, split.values())) == [1, 1, 1]
+
 # MinesweeperAI Class Tests (These will be more involved due to the AI's logic)
 
 def test_minesweeperai_initialization():
@@ -104,6 +219,124 @@ def test_minesweeperai_add_knowledge_basic():
     assert ai.knowledge[0].cells == {(0, 0), (0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)}
     assert ai.knowledge[0].count == 0
 
+def test_minesweeperai_infers_by_subset():
+    ai = MinesweeperAI(height=2, width=3)
+    ai.add_knowledge((0, 0), 1)
+    ai.add_knowledge((0, 1), 1)
+    # {(1, 0), (1, 1)} = 1 is a subset of {(0, 2), (1, 0), (1, 1), (1, 2)} = 1
+    assert {(0, 2), (1, 2)} <= ai.safes
+    assert ai.make_safe_move() in {(0, 2), (1, 2)}
+    assert len(ai.inference_times) == 2
+
+def test_minesweeperai_infers_mines_to_fixpoint():
+    ai = MinesweeperAI(height=1, width=4)
+    ai.add_knowledge((0, 0), 1)
+    assert ai.mines == {(0, 1)}
+    ai.add_knowledge((0, 2), 2)
+    assert ai.mines == {(0, 1), (0, 3)}
+    assert len(ai.knowledge) == 0
+
+# Mine Probability Tests
+
+def test_count_solutions():
+    cells, counts = count_solutions([Sentence({(0, 0), (0, 1)}, 1),
+                                     Sentence({(0, 1), (0, 2)}, 1)])
+    # Either (0, 1) alone, or (0, 0) and (0, 2)
+    assert counts[1][0] == 1 and counts[2][0] == 1
+    assert dict(zip(cells, counts[1][1])) == {(0, 0): 0, (0, 1): 1, (0, 2): 0}
+    assert dict(zip(cells, counts[2][1])) == {(0, 0): 1, (0, 1): 0, (0, 2): 1}
+
+def test_mine_probabilities_use_mine_count():
+    ai = MinesweeperAI(height=1, width=5, total_mines=1)
+    ai.add_knowledge((0, 2), 1)
+    assert ai.mine_probabilities() == {(0, 0): 0, (0, 1): 0.5, (0, 3): 0.5, (0, 4): 0}
+    assert ai.make_random_move() in {(0, 0), (0, 4)}
+
+def test_mine_probabilities_weigh_frontier_solutions():
+    ai = MinesweeperAI(height=1, width=6, total_mines=2)
+    ai.add_knowledge((0, 1), 1)
+    # Frontier {(0, 0), (0, 2)} holds one mine; the other is among three cells
+    probabilities = ai.mine_probabilities()
+    assert probabilities[(0, 0)] == probabilities[(0, 2)] == 0.5
+    assert abs(probabilities[(0, 4)] - 1 / 3) < 1e-9
+
+def test_mine_probabilities_reuse_unchanged_components(monkeypatch):
+    import minesweeper
+    ai = MinesweeperAI(height=5, width=9, total_mines=3)
+    ai.add_knowledge((0, 0), 1)
+    ai.add_knowledge((4, 8), 1)
+    ai.mine_probabilities()
+    counted = []
+    monkeypatch.setattr(minesweeper, "count_solutions",
+                        lambda *args: counted.append(args) or count_solutions(*args))
+    ai.add_knowledge((4, 6), 1)
+    ai.mine_probabilities()
+    # Only the component around (4, 7) changed, and only it is counted again
+    assert len(counted) == 1
+    assert len(counted[0][0]) == 2
+    assert all((4, 7) in sentence.cells for sentence in counted[0][0])
+
+def test_indexable_set():
+    items = IndexableSet(10)
+    for item in (9, 0, 4, 0, 8, 12):
+        items.discard(item)
+    assert len(items) == 6
+    assert sorted(items) == [1, 2, 3, 5, 6, 7]
+    assert 4 not in items and 9 not in items and 12 not in items and 3 in items
+    assert {items.choice() for _ in range(200)} == {1, 2, 3, 5, 6, 7}
+
+def test_sparse_ai_guesses_like_dense_ai():
+    ai = MinesweeperAI(height=1, width=5, total_mines=1, sparse=True)
+    ai.add_knowledge((0, 2), 1)
+    # (0, 2) is chosen; the mine is at (0, 1) or (0, 3), so the two
+    # interior cells are safe
+    assert sorted(ai.unknown) == [0, 1, 3, 4]
+    assert ai.frontier_probabilities()[1:] == (0, 2)
+    assert {ai.make_random_move() for _ in range(50)} == {(0, 0), (0, 4)}
+    ai = MinesweeperAI(height=1, width=6, total_mines=2, sparse=True)
+    ai.add_knowledge((0, 1), 1)
+    assert {ai.make_random_move() for _ in range(50)} == {(0, 3), (0, 4), (0, 5)}
+
+def test_sparse_ai_mine_probabilities_match_dense_ai():
+    sparse = MinesweeperAI(height=3, width=6, total_mines=3, sparse=True)
+    dense = MinesweeperAI(height=3, width=6, total_mines=3)
+    for ai in (sparse, dense):
+        ai.add_knowledge((0, 0), 1)
+        ai.add_knowledge((2, 5), 0)
+    assert sparse.mine_probabilities() == dense.mine_probabilities()
+
+# Simulation Tests
+
+def test_simulated_games_replay_from_seed():
+    games = [play_game(8, 8, 8, seed) for seed in range(5)]
+    for game in games:
+        replay = play_game(8, 8, 8, game["seed"])
+        assert (replay["won"], replay["moves"]) == (game["won"], game["moves"])
+        assert len(game["latencies"]) == game["moves"]
+    summary = summarize(games)
+    assert 0 <= summary["win"] <= 1
+    assert summary["games"] == 5
+    assert summary["moves_per_game"] == sum(game["moves"] for game in games) / 5
+
+def test_simulated_games_replay_with_estimates(monkeypatch):
+    import minesweeper
+    # Estimate every component of more than two cells, and make counting
+    # fail if it is ever given a wall-clock deadline
+    monkeypatch.setattr(minesweeper, "MAX_COMPONENT_CELLS", 2)
+    estimated = []
+    estimate_solutions = minesweeper.estimate_solutions
+    monkeypatch.setattr(minesweeper, "estimate_solutions",
+                        lambda component: estimated.append(component) or estimate_solutions(component))
+    def count(sentences, deadline=None):
+        assert deadline is None
+        return count_solutions(sentences)
+    monkeypatch.setattr(minesweeper, "count_solutions", count)
+    for seed in range(5):
+        game = play_game(8, 8, 8, seed)
+        replay = play_game(8, 8, 8, seed)
+        assert (replay["won"], replay["moves"]) == (game["won"], game["moves"])
+    assert estimated
+
 # ... More elaborate tests for add_knowledge, considering different cell positions, counts,
 # and existing knowledge in the AI's knowledge base
 
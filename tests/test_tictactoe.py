@@ -0,0 +1,123 @@
+import pytest
+from tictactoe import (X, O, EMPTY, initial_state, winner, terminal, minimax, alphabeta, Budget,
+                       SearchState, maxvalue, minvalue, _maxvalue, _minvalue)
+from engines import engine
+from mcts import mcts
+from tournament import play_game, summarize
+
+# Board Tests
+
+def test_initial_state_shape():
+    board = initial_state(6, 7)
+    assert len(board) == 6
+    assert all(len(row) == 7 for row in board)
+    assert all(cell is EMPTY for row in board for cell in row)
+
+def test_winner_k_in_a_row():
+    board = initial_state(5, 5)
+    board[1][1] = board[2][2] = board[3][3] = X
+    assert winner(board) is None  # Classic rules need the full diagonal
+    assert winner(board, k=3) == X
+    assert terminal(board, k=3)
+    assert not terminal(board, k=4)
+
+def test_winner_anti_diagonal():
+    board = initial_state(4, 4)
+    board[0][3] = board[1][2] = board[2][1] = board[3][0] = O
+    assert winner(board) == O
+
+# Search Tests
+
+def test_alphabeta_takes_win():
+    board = [[X, X, EMPTY],
+             [O, O, EMPTY],
+             [EMPTY, EMPTY, EMPTY]]
+    assert alphabeta(board) == (0, 2)
+
+def test_alphabeta_blocks_on_large_board():
+    board = initial_state(5, 5)
+    board[0][0] = board[0][1] = board[0][2] = X
+    board[4][4] = board[3][3] = O
+    assert alphabeta(board, k=4, time_limit=1) == (0, 3)
+
+def test_alphabeta_reports_depth():
+    board = [[X, EMPTY, EMPTY],
+             [EMPTY, O, EMPTY],
+             [EMPTY, EMPTY, EMPTY]]
+    budget = Budget()
+    move = alphabeta(board, budget=budget)
+    assert budget.depth > 0
+    assert move in {(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)}
+
+def test_mcts_blocks_on_large_board():
+    board = initial_state(6, 7)
+    board[0][0] = board[0][1] = board[0][2] = X
+    board[5][5] = board[4][4] = O
+    assert mcts(board, k=4, iterations=3000, time_limit=None, seed=1) == (0, 3)
+
+def test_search_state_play_and_undo():
+    board = [[X, O, EMPTY],
+             [EMPTY, X, EMPTY],
+             [O, EMPTY, EMPTY]]
+    state = SearchState(board)
+    assert state.turn == X and not state.terminal()
+    assert sorted(state.moves()) == [(0, 2), (1, 0), (1, 2), (2, 1), (2, 2)]
+    state.play((2, 2))
+    assert state.terminal() and state.utility() == 1
+    state.undo((2, 2))
+    assert state.board == board and state.turn == X and not state.terminal()
+    for action in [(1, 0), (1, 2), (0, 2)]:
+        state.play(action)
+    assert state.board[1] == [X, X, O] and state.turn == O
+    for action in [(0, 2), (1, 2), (1, 0)]:
+        state.undo(action)
+    assert state.board == board and state.empty == 5
+
+def test_unchecked_search_agrees_with_validated_search():
+    positions = [
+        [[X, O, EMPTY], [EMPTY, X, EMPTY], [O, EMPTY, EMPTY]],
+        [[X, EMPTY, EMPTY], [EMPTY, O, EMPTY], [EMPTY, EMPTY, EMPTY]],
+        [[X, X, O], [O, O, X], [X, EMPTY, EMPTY]],
+        [[X, O, X], [EMPTY, O, EMPTY], [EMPTY, EMPTY, EMPTY]],
+    ]
+    for board in positions:
+        state = SearchState(board)
+        if state.turn == X:
+            assert _maxvalue(state, None) == maxvalue(board)
+        else:
+            assert _minvalue(state, None) == minvalue(board)
+        assert state.board == board
+
+def test_cancelled_budget_stops_search():
+    budget = Budget(30)
+    budget.cancel()
+    assert budget.expired()
+    board = initial_state(3, 3)
+    board[1][1] = X
+    assert minimax(board, budget=budget) is None
+    assert alphabeta(initial_state(6, 7), k=4, budget=budget) is not None
+    assert mcts(board, budget=budget) in [(i, j) for i in range(3) for j in range(3) if (i, j) != (1, 1)]
+    assert mcts(board, time_limit=1e-9) is not None
+
+def test_engines_share_interface():
+    board = [[X, X, EMPTY],
+             [O, O, EMPTY],
+             [EMPTY, EMPTY, EMPTY]]
+    for name in ["minimax", "alphabeta", "mcts"]:
+        assert engine(name)(board, None, Budget(1)) == (0, 2)
+    with pytest.raises(ValueError):
+        engine("nosuchengine")
+
+# Tournament Tests
+
+def test_table_never_loses_to_random():
+    games = [play_game("random", "table", 3, 3, None, None, seed) for seed in range(5)]
+    assert all(game["winner"] in ("table", None) for game in games)
+    summary = summarize(games, ["random", "table"])
+    assert summary["table"]["loss"] == 0.0
+    assert summary["random"]["games"] == 5
+    assert summary["table"]["moves"] == sum(
+        1 for game in games for move in game["moves"] if move["engine"] == "table")
+
+if __name__ == "__main__":
+    pytest.main()
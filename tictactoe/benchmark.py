@@ -0,0 +1,99 @@
+"""
+Reports how deep alphabeta searches per move on several board shapes, or,
+with `profile`, how much search time the unchecked make/unmake path saves
+over searching through the validated result().
+
+Usage: python benchmark.py [seconds | profile]
+"""
+
+import cProfile
+import pstats
+import sys
+import time
+
+import tictactoe as ttt
+
+# (rows, cols, k) board shapes to benchmark
+SHAPES = [
+    (3, 3, 3),
+    (4, 4, 4),
+    (5, 5, 4),
+    (6, 7, 4),
+]
+
+
+def opening(rows, cols):
+    """
+    Returns a board a few moves into the game, so the search does not
+    start from a symmetric empty board.
+    """
+    board = ttt.initial_state(rows, cols)
+    board[rows // 2][cols // 2] = ttt.X
+    board[rows // 2][cols // 2 - 1] = ttt.O
+    return board
+
+
+def depth_per_second(rows, cols, k, seconds):
+    """
+    Runs one timed alphabeta search and returns its Budget.
+    """
+    budget = ttt.Budget(seconds)
+    ttt.alphabeta(opening(rows, cols), k, budget=budget)
+    return budget
+
+
+def validated_search(board):
+    """
+    Solves the board through result() and the validated maxvalue and
+    minvalue, the way minimax searched before SearchState.
+    """
+    if ttt.player(board) == ttt.X:
+        return max(ttt.minvalue(ttt.result(board, action)) for action in ttt.actions(board))
+    return min(ttt.maxvalue(ttt.result(board, action)) for action in ttt.actions(board))
+
+
+def profile():
+    """
+    Profiles a full 3x3 search both ways and prints the share of search
+    time the unchecked path saves.
+    """
+    board = ttt.initial_state()
+    board[0][0] = ttt.X
+
+    profiler = cProfile.Profile()
+    profiler.runcall(validated_search, board)
+    print("Validated search, by own time:")
+    pstats.Stats(profiler).sort_stats("tottime").print_stats(8)
+
+    # Time both without the profiler's overhead
+    start = time.perf_counter()
+    validated_search(board)
+    validated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ttt.minimax(board)
+    unchecked = time.perf_counter() - start
+
+    print(f"validated: {validated:.3f}s  unchecked: {unchecked:.3f}s  "
+          f"saved: {1 - unchecked / validated:.1%}")
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [seconds | profile]")
+    if sys.argv[1:] == ["profile"]:
+        profile()
+        return
+    seconds = float(sys.argv[1]) if len(sys.argv) == 2 else ttt.TIME_LIMIT
+
+    print(f"{'board':>10} {'depth':>6} {'nodes':>10} {'nodes/s':>10} {'time':>7}")
+    for rows, cols, k in SHAPES:
+        budget = depth_per_second(rows, cols, k, seconds)
+        elapsed = budget.elapsed()
+        print(f"{f'{rows}x{cols} k={k}':>10} {budget.depth:>6} "
+              f"{budget.nodes:>10} {budget.nodes / elapsed:>10.0f} "
+              f"{elapsed:>6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Tic-tac-toe engines, looked up by name.
+
+Every engine is called as engine(board, k=None, budget=None) and returns
+the action (i, j) it picks for the player to move, or None if the game is
+over. A ttt.Budget sets the time allowed and collects search statistics.
+"""
+
+import random
+
+import mcts
+import tictactoe as ttt
+
+
+def random_move(board, k=None, budget=None):
+    """
+    Returns a uniformly random available action.
+    """
+    if ttt.terminal(board, k):
+        return None
+    if budget is not None:
+        budget.nodes += 1
+    return random.choice(tuple(ttt.actions(board)))
+
+
+ENGINES = {
+    "random": random_move,
+    "minimax": ttt.minimax,
+    "alphabeta": ttt.alphabeta,
+    "table": ttt.table,
+    "mcts": mcts.mcts,
+}
+
+
+def engine(name):
+    """
+    Returns the engine registered under name.
+    """
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"unknown engine {name}, choose from {', '.join(ENGINES)}")
@@ -0,0 +1,228 @@
+"""
+Monte Carlo Tree Search (UCT) player for m,n,k tic-tac-toe boards.
+
+The search works on a compact copy of the board: one integer bitmask of
+cells per player, with cell (i, j) stored at bit i * cols + j.
+"""
+
+import concurrent.futures
+import functools
+import math
+import random
+import time
+
+import tictactoe as ttt
+
+# Exploration constant for UCT selection
+EXPLORATION = math.sqrt(2)
+
+# Playouts to run when a search has neither a time limit nor an iteration count
+ITERATIONS = 10000
+
+
+@functools.lru_cache(maxsize=None)
+def win_masks(rows, cols, k):
+    """
+    Returns, for every cell index, a tuple of bitmasks of the winning
+    lines that pass through that cell.
+    """
+    by_cell = [[] for _ in range(rows * cols)]
+    for line in ttt.lines(rows, cols, k):
+        mask = 0
+        for i, j in line:
+            mask |= 1 << (i * cols + j)
+        for i, j in line:
+            by_cell[i * cols + j].append(mask)
+    return tuple(tuple(masks) for masks in by_cell)
+
+
+def bitboard(board):
+    """
+    Returns the (X bits, O bits) encoding of a board.
+    """
+    xbits = 0
+    obits = 0
+    cols = len(board[0])
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell == ttt.X:
+                xbits |= 1 << (i * cols + j)
+            elif cell == ttt.O:
+                obits |= 1 << (i * cols + j)
+    return xbits, obits
+
+
+def cells(bits):
+    """
+    Returns the list of cell indices set in bits.
+    """
+    found = []
+    while bits:
+        low = bits & -bits
+        found.append(low.bit_length() - 1)
+        bits ^= low
+    return found
+
+
+def wins(bits, cell, masks):
+    """
+    Returns True if a player's bits hold a complete line through cell.
+    """
+    for mask in masks[cell]:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+class Node():
+    """
+    A position in the search tree, reached by `player` marking `move`.
+    """
+
+    def __init__(self, parent, move, player, untried, winner=None):
+        self.parent = parent
+        self.move = move
+        self.player = player
+        self.untried = untried
+        self.winner = winner
+        self.children = []
+        self.wins = 0.0
+        self.visits = 0
+
+    def select(self):
+        """
+        Returns the child with the highest UCT score.
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: (
+            child.wins / child.visits
+            + EXPLORATION * math.sqrt(log_visits / child.visits)
+        ))
+
+
+def rollout(bits, to_move, empty, masks, rng):
+    """
+    Plays random moves into the empty cells until the game ends, and
+    returns the winning player (0 for X, 1 for O) or None for a tie.
+    Modifies `bits` and `empty`.
+    """
+    rng.shuffle(empty)
+    for cell in empty:
+        bits[to_move] |= 1 << cell
+        if wins(bits[to_move], cell, masks):
+            return to_move
+        to_move = 1 - to_move
+    return None
+
+
+def search(xbits, obits, rows, cols, k, iterations, time_limit, seed=None,
+           stop=None):
+    """
+    Runs UCT from the given position and returns (playouts, statistics),
+    where statistics maps each root move's cell index to its
+    (visits, wins) for the player to move. The search also ends early
+    once `stop()`, if given, returns True, though never before the first
+    playout.
+    """
+    rng = random.Random(seed)
+    masks = win_masks(rows, cols, k)
+    full = (1 << (rows * cols)) - 1
+    to_move = 0 if bin(xbits).count("1") == bin(obits).count("1") else 1
+    root = Node(None, None, 1 - to_move, cells(full & ~(xbits | obits)))
+
+    if iterations is None and time_limit is None:
+        iterations = ITERATIONS
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    playouts = 0
+    while iterations is None or playouts < iterations:
+        if playouts and deadline is not None and time.perf_counter() >= deadline:
+            break
+        if playouts and stop is not None and stop():
+            break
+        playouts += 1
+        node = root
+        bits = [xbits, obits]
+
+        # Selection: descend through fully expanded nodes
+        while not node.untried and node.children:
+            node = node.select()
+            bits[node.player] |= 1 << node.move
+
+        # Expansion: add one untried move as a new child
+        if node.untried:
+            index = rng.randrange(len(node.untried))
+            node.untried[index], node.untried[-1] = node.untried[-1], node.untried[index]
+            move = node.untried.pop()
+            player = 1 - node.player
+            bits[player] |= 1 << move
+            if wins(bits[player], move, masks):
+                child = Node(node, move, player, [], winner=player)
+            else:
+                child = Node(node, move, player, cells(full & ~(bits[0] | bits[1])))
+            node.children.append(child)
+            node = child
+
+        # Simulation: finish the game at random
+        if node.winner is not None or not node.untried:
+            winner = node.winner
+        else:
+            winner = rollout(bits, 1 - node.player, list(node.untried), masks, rng)
+
+        # Backpropagation: credit each node to the player who moved into it
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.player:
+                node.wins += 1
+            node = node.parent
+
+    return playouts, {child.move: (child.visits, child.wins) for child in root.children}
+
+
+def mcts(board, k=None, budget=None, time_limit=ttt.TIME_LIMIT,
+         iterations=None, workers=1, seed=None):
+    """
+    Returns the action chosen by Monte Carlo Tree Search for the current
+    player on the board.
+
+    The search stops after `iterations` playouts or `time_limit` seconds,
+    whichever comes first. With `workers` greater than 1, independent trees
+    are searched in a process pool and their root visit counts are summed
+    (root parallelisation). Pass a Budget to read back the number of
+    playouts; its time limit then overrides `time_limit`. Cancelling the
+    Budget stops a single-process search at once, while pool workers run
+    until their time or iterations are used up.
+    """
+    if ttt.terminal(board, k):
+        return None
+
+    if budget is None:
+        budget = ttt.Budget(time_limit)
+    rows = len(board)
+    cols = len(board[0])
+    k = ttt.line_length(board, k)
+    xbits, obits = bitboard(board)
+
+    if workers > 1:
+        if iterations is not None:
+            iterations = math.ceil(iterations / workers)
+        seeds = [None if seed is None else seed + n for n in range(workers)]
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(search, xbits, obits, rows, cols, k,
+                                   iterations, budget.remaining(), s)
+                       for s in seeds]
+            results = [future.result() for future in futures]
+    else:
+        results = [search(xbits, obits, rows, cols, k,
+                          iterations, budget.remaining(), seed, budget.expired)]
+
+    visits = {}
+    for playouts, statistics in results:
+        budget.nodes += playouts
+        for move, (count, _) in statistics.items():
+            visits[move] = visits.get(move, 0) + count
+
+    move = max(visits, key=visits.get)
+    return (move // cols, move % cols)
@@ -1,8 +1,29 @@
+import concurrent.futures
 import pygame
 import sys
 import time
 
 import tictactoe as ttt
+from engines import engine
+
+if len(sys.argv) not in [1, 2, 4, 5]:
+    sys.exit("Usage: python runner.py [rows cols k] [engine]")
+if len(sys.argv) >= 4:
+    rows, cols, k = (int(arg) for arg in sys.argv[1:4])
+else:
+    rows, cols, k = ttt.ROWS, ttt.COLS, None
+
+# Exhaustive minimax is only practical on the classic board
+if len(sys.argv) in [2, 5]:
+    name = sys.argv[-1]
+elif (rows, cols) == (ttt.ROWS, ttt.COLS):
+    name = "minimax"
+else:
+    name = "alphabeta"
+try:
+    ai = engine(name)
+except ValueError as e:
+    sys.exit(str(e))
 
 pygame.init()
 size = width, height = 600, 400
@@ -15,16 +36,31 @@ screen = pygame.display.set_mode(size)
 
 mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
-moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
+
+# Shrink tiles so larger boards still fit in the window
+tile_size = min(80, (height - 140) // rows, (width - 40) // cols)
+moveFont = pygame.font.Font("OpenSans-Regular.ttf", tile_size * 3 // 4)
+
+# Frames drawn per second while waiting for input or for the AI
+FPS = 30
 
 user = None
-board = ttt.initial_state()
-ai_turn = False
+board = ttt.initial_state(rows, cols)
+
+# The AI searches on a worker thread so the window keeps responding;
+# `search` is the Future for its move and `budget` lets us cancel it
+executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+search = None
+budget = None
+clock = pygame.time.Clock()
 
 while True:
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            if budget is not None:
+                budget.cancel()
+            executor.shutdown(wait=False)
             sys.exit()
 
     screen.fill(black)
@@ -67,13 +103,12 @@ while True:
     else:
 
         # Draw game board
-        tile_size = 80
-        tile_origin = (width / 2 - (1.5 * tile_size),
-                       height / 2 - (1.5 * tile_size))
+        tile_origin = (width / 2 - (cols / 2 * tile_size),
+                       height / 2 - (rows / 2 * tile_size))
         tiles = []
-        for i in range(3):
+        for i in range(rows):
             row = []
-            for j in range(3):
+            for j in range(cols):
                 rect = pygame.Rect(
                     tile_origin[0] + j * tile_size,
                     tile_origin[1] + i * tile_size,
@@ -89,12 +124,12 @@ while True:
                 row.append(rect)
             tiles.append(row)
 
-        game_over = ttt.terminal(board)
+        game_over = ttt.terminal(board, k)
         player = ttt.player(board)
 
         # Show title
         if game_over:
-            winner = ttt.winner(board)
+            winner = ttt.winner(board, k)
             if winner is None:
                 title = f"Game Over: Tie."
             else:
@@ -102,7 +137,8 @@ while True:
         elif user == player:
             title = f"Play as {user}"
         else:
-            title = f"Computer thinking..."
+            dots = "." * (int(budget.elapsed() * 2) % 4) if budget else ""
+            title = f"Computer thinking{dots:<3}"
         title = largeFont.render(title, True, white)
         titleRect = title.get_rect()
         titleRect.center = ((width / 2), 30)
@@ -112,26 +148,29 @@ while True:
 
         # Check for AI move
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if search is None:
+                budget = ttt.Budget(ttt.TIME_LIMIT)
+                search = executor.submit(ai, [row.copy() for row in board], k, budget)
+            elif search.done():
+                move = search.result()
+                board = ttt.result(board, move, k)
+                search = None
+                budget = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
         if click == 1 and user == player and not game_over:
             mouse = pygame.mouse.get_pos()
-            for i in range(3):
-                for j in range(3):
+            for i in range(rows):
+                for j in range(cols):
                     if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
-                        board = ttt.result(board, (i, j))
+                        board = ttt.result(board, (i, j), k)
 
-        if game_over:
+        # Offer a new game once this one is over, or while the AI thinks
+        thinking = search is not None
+        if game_over or thinking:
             againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
+            again = mediumFont.render("Play Again" if game_over else "Reset", True, black)
             againRect = again.get_rect()
             againRect.center = againButton.center
             pygame.draw.rect(screen, white, againButton)
@@ -141,8 +180,13 @@ while True:
                 mouse = pygame.mouse.get_pos()
                 if againButton.collidepoint(mouse):
                     time.sleep(0.2)
+                    # Abandon the search for this game, if one is running
+                    if thinking:
+                        budget.cancel()
+                        search = None
+                        budget = None
                     user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
+                    board = ttt.initial_state(rows, cols)
 
     pygame.display.flip()
+    clock.tick(FPS)
@@ -1,22 +1,72 @@
 """
 Tic Tac Toe Player
+
+Boards may be any m x n grid; a player wins with k of their marks in a
+row, column or diagonal. Functions that need k take it as an optional
+argument and default to the length of the shorter board side, which is
+classic tic-tac-toe on a 3 x 3 board.
 """
 
+import functools
 import math
 import random
+import time
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Default board shape
+ROWS = 3
+COLS = 3
+
+# Default time in seconds alphabeta may spend on a move
+TIME_LIMIT = 1.0
 
-def initial_state():
+
+def initial_state(rows=ROWS, cols=COLS):
     """
     Returns starting state of the board.
     """
-    return [[EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY]]
+    return [[EMPTY] * cols for _ in range(rows)]
+
+
+def line_length(board, k=None):
+    """
+    Returns the number of marks in a row needed to win on the board.
+    """
+    if k is None:
+      return min(len(board), len(board[0]))
+    return k
+
+
+@functools.lru_cache(maxsize=None)
+def lines(rows, cols, k):
+    """
+    Returns every line of k cells on a rows x cols board, as a tuple of
+    tuples of (i, j) cells. Lines run across, down and along both diagonals.
+    """
+    found = []
+    for i in range(rows):
+      for j in range(cols):
+        for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+          if 0 <= i + (k - 1) * di < rows and 0 <= j + (k - 1) * dj < cols:
+            found.append(tuple((i + s * di, j + s * dj) for s in range(k)))
+    return tuple(found)
+
+
+@functools.lru_cache(maxsize=None)
+def lines_through(rows, cols, k):
+    """
+    Returns a dict mapping every cell of a rows x cols board to the lines
+    of k cells that pass through it.
+    """
+    through = {(i, j): [] for i in range(rows) for j in range(cols)}
+    for line in lines(rows, cols, k):
+      for cell in line:
+        through[cell].append(line)
+    return through
+
 
 def player(board):
     """
@@ -49,22 +99,19 @@ def actions(board):
     return options
 
 
-def result(board, action):
+def result(board, action, k=None):
     """
     Returns the board that results from making move (i, j) on the board.
     """
     playr = player(board)
-    res = initial_state()
 
-    if terminal(board):
+    if terminal(board, k):
         raise ValueError("Game over.")
     elif action not in actions(board):
         raise ValueError("Invalid action.")
 
     # Overlay the previous boars state
-    for row in range(len(board)):
-      for col in range(len(board[row])):
-        res[row][col] = board[row][col]
+    res = [row.copy() for row in board]
 
     # Make the move, return the result
     if board[action[0]][action[1]] == EMPTY:
@@ -75,49 +122,23 @@ def result(board, action):
               % (int(action[0]), int(action[1]), playr))
 
 
-def winner(board):
+def winner(board, k=None):
     """
     Returns the winner of the game, if there is one.
     """
-    ## First the rows
-    for row in range(len(board)):
-      if all(i == board[row][0] for i in board[row]) and board[row][0]:
-        return board[row][0]
-
-    ## Next, the colums
-    for col in range(len(board[0])):
-      list = []
-      for row in range(len(board)):
-        list.append(board[row][col])
-      if all(i == list[0] for i in list) and list[0]:
-        return list[0]
-
-    ## Next, the diagonals:
-    ## top,left -> bottom,right 
-    list = []
-    col = 0
-    for row in range(len(board)):
-      list.append(board[row][col])
-      col += 1
-    if all(i == list[0] for i in list) and list[0]:
-      return list[0]
-
-    ## bottom,left -> top,right
-    list = []
-    col = len(board[0])-1
-    for row in range(len(board)):
-      list.append(board[row][col])
-      col -= 1
-    if all(i == list[0] for i in list) and list[0]:
-      return list[0]
+    k = line_length(board, k)
+    for line in lines(len(board), len(board[0]), k):
+      first = board[line[0][0]][line[0][1]]
+      if first and all(board[i][j] == first for i, j in line):
+        return first
 
     return None
 
-def terminal(board):
+def terminal(board, k=None):
     """
     Returns True if game is over, False otherwise.
     """
-    val = winner(board)
+    val = winner(board, k)
     if val:
       return True   ## We have a winner
     else:
@@ -128,38 +149,53 @@ def terminal(board):
     return True
 
 
-def utility(board):
+def utility(board, k=None):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    val = winner(board)
+    val = winner(board, k)
     if val:
       if val == X:
         return 1
       if val == O:
         return -1
-      
+
     return 0
 
 
-def minimax(board):
+def minimax(board, k=None, budget=None):
     """
     Returns the optimal action for the current player on the board.
+    Always searches the whole game tree, ignoring any time limit; a Budget
+    counts the nodes, and cancelling it abandons the search.
     """
-    if terminal(board):
+    if terminal(board, k):
       return None
 
     # If empty board is provided as input, return a random first move.
-    if board == initial_state():
-      return (random.randint(0,2),random.randint(0,2))
+    if not any(cell for row in board for cell in row):
+      return random.choice(tuple(actions(board)))
 
     playr = player(board)
 
+    try:
+      return _minimax_root(board, playr, k, budget)
+    except SearchTimeout:
+      return None
+
+
+def _minimax_root(board, playr, k, budget):
+    """
+    Returns the best action for playr by searching every move to the end.
+    """
+    state = SearchState(board, k)
     if playr == X:
       bestmove = None
       bestscore = -math.inf
       for action in actions(board):
-        val = minvalue(result(board, action))
+        state.play(action)
+        val = _minvalue(state, budget)
+        state.undo(action)
 
         if val > bestscore:
           bestscore = val
@@ -168,7 +204,9 @@ def minimax(board):
       bestmove = None
       bestscore = math.inf
       for action in actions(board):
-        val = maxvalue(result(board, action))
+        state.play(action)
+        val = _maxvalue(state, budget)
+        state.undo(action)
 
         if val < bestscore:
           bestscore = val
@@ -177,30 +215,405 @@ def minimax(board):
     return bestmove
 
 
-def maxvalue(board):
+def maxvalue(board, k=None, budget=None):
     """
     Returns the optimal action for the current player on the board.
     """
-    if terminal(board):
-      return utility(board)
+    if budget is not None:
+      budget.nodes += 1
+      if budget.cancelled:
+        raise SearchTimeout
+    if terminal(board, k):
+      return utility(board, k)
 
     val = -math.inf
     for action in actions(board):
-      val = max(val, minvalue(result(board, action)))
+      val = max(val, minvalue(result(board, action, k), k, budget))
 
     return val
-      
-       
-def minvalue(board):
+
+
+def minvalue(board, k=None, budget=None):
     """
     Returns the optimal action for the current player on the board.
     """
-    if terminal(board):
-      return utility(board)
+    if budget is not None:
+      budget.nodes += 1
+      if budget.cancelled:
+        raise SearchTimeout
+    if terminal(board, k):
+      return utility(board, k)
 
     val = math.inf
     for action in actions(board):
-      val = min(val, maxvalue(result(board, action)))
+      val = min(val, maxvalue(result(board, action, k), k, budget))
+
+    return val
+
+
+def _maxvalue(state, budget):
+    """
+    Like maxvalue, but searches a SearchState in place.
+    """
+    if budget is not None:
+      budget.nodes += 1
+      if budget.cancelled:
+        raise SearchTimeout
+    if state.terminal():
+      return state.utility()
+
+    val = -math.inf
+    for action in state.moves():
+      state.play(action)
+      val = max(val, _minvalue(state, budget))
+      state.undo(action)
+
+    return val
+
+
+def _minvalue(state, budget):
+    """
+    Like minvalue, but searches a SearchState in place.
+    """
+    if budget is not None:
+      budget.nodes += 1
+      if budget.cancelled:
+        raise SearchTimeout
+    if state.terminal():
+      return state.utility()
+
+    val = math.inf
+    for action in state.moves():
+      state.play(action)
+      val = min(val, _maxvalue(state, budget))
+      state.undo(action)
+
+    return val
+
+
+class SearchState():
+    """
+    Mutable copy of a board used inside searches.
+
+    Moves are made and unmade in place, without the validation and copying
+    done by result(), and only the lines through the last move are checked
+    for a win. Search code must only play empty cells while the game is not
+    over, and undo moves in the reverse order it made them.
+    """
+
+    def __init__(self, board, k=None):
+        self.board = [row.copy() for row in board]
+        self.k = line_length(board, k)
+        rows = len(board)
+        cols = len(board[0])
+        self.through = lines_through(rows, cols, self.k)
+
+        # Cells nearest the centre first, which tend to be the best moves
+        ci = (rows - 1) / 2
+        cj = (cols - 1) / 2
+        self.order = sorted(self.through,
+                            key=lambda a: (abs(a[0] - ci) + abs(a[1] - cj), a))
+
+        self.empty = sum(row.count(EMPTY) for row in board)
+        self.turn = player(board)
+        self.winner = winner(board, self.k)
+
+    def moves(self):
+        """
+        Returns the empty cells as a list, nearest to the centre first.
+        """
+        board = self.board
+        return [cell for cell in self.order if board[cell[0]][cell[1]] is EMPTY]
+
+    def play(self, action):
+        """
+        Marks action for the player to move.
+        """
+        board = self.board
+        mark = self.turn
+        board[action[0]][action[1]] = mark
+        self.empty -= 1
+        for line in self.through[action]:
+          if all(board[i][j] == mark for i, j in line):
+            self.winner = mark
+            break
+        self.turn = O if mark == X else X
+
+    def undo(self, action):
+        """
+        Takes back action, which must be the last move played.
+        """
+        self.board[action[0]][action[1]] = EMPTY
+        self.empty += 1
+        self.turn = O if self.turn == X else X
+        self.winner = None
+
+    def terminal(self):
+        """
+        Returns True if the game is over.
+        """
+        return self.winner is not None or self.empty == 0
+
+    def utility(self):
+        """
+        Returns 1 if X has won, -1 if O has won, 0 otherwise.
+        """
+        if self.winner == X:
+          return 1
+        elif self.winner == O:
+          return -1
+        return 0
+
+
+class Budget():
+    """
+    Time allowance and statistics for a single search.
+    """
+
+    def __init__(self, time_limit=None):
+        self.time_limit = time_limit
+        self.start = time.perf_counter()
+        if time_limit is None:
+            self.deadline = None
+        else:
+            self.deadline = self.start + time_limit
+
+        # Positions visited and deepest search depth completed
+        self.nodes = 0
+        self.depth = 0
+
+        # Set from another thread to stop the search early
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Asks the search using this budget to stop as soon as it can.
+        """
+        self.cancelled = True
+
+    def expired(self):
+        """
+        Returns True once the time allowance has been used up or the
+        search has been cancelled.
+        """
+        if self.cancelled:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def remaining(self):
+        """
+        Returns seconds left before the deadline, or None if there is none.
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def elapsed(self):
+        """
+        Returns seconds since the search started.
+        """
+        return time.perf_counter() - self.start
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside a search when its budget runs out.
+    """
+
+
+def heuristic(board, k=None):
+    """
+    Returns an estimate of how good a non-terminal board is for X,
+    strictly between -1 and 1.
+
+    Every line that only one player has marks on is still winnable by that
+    player, and counts 10 ** (marks - 1) in their favour.
+    """
+    k = line_length(board, k)
+    score = 0
+    for line in lines(len(board), len(board[0]), k):
+      xs = 0
+      os = 0
+      for i, j in line:
+        if board[i][j] == X:
+          xs += 1
+        elif board[i][j] == O:
+          os += 1
+      if xs and not os:
+        score += 10 ** (xs - 1)
+      elif os and not xs:
+        score -= 10 ** (os - 1)
+    return score / (abs(score) + 1)
+
+
+def alphabeta(board, k=None, budget=None, time_limit=TIME_LIMIT,
+              evaluate=heuristic, max_depth=None):
+    """
+    Returns the best action found for the current player on the board by
+    iterative-deepening alpha-beta search.
+
+    The search deepens one ply at a time until the whole game tree has been
+    searched, `max_depth` is reached or `time_limit` seconds have passed, and
+    returns the best move of the deepest completed iteration. Positions at
+    the depth limit are scored with `evaluate(board, k)`, which must return
+    a value strictly between -1 and 1 from X's point of view.
+
+    Pass a Budget to read back the depth reached and nodes searched; its
+    time limit then overrides `time_limit`.
+    """
+    if terminal(board, k):
+      return None
+
+    if budget is None:
+      budget = Budget(time_limit)
+
+    state = SearchState(board, k)
+    moves = state.moves()
+    empties = len(moves)
+    if max_depth is None or max_depth > empties:
+      max_depth = empties
+    maximizing = player(board) == X
+
+    bestmove = moves[0]
+    for depth in range(1, max_depth + 1):
+      try:
+        bestscore, move = _alphabeta_root(state, depth, moves, maximizing,
+                                          evaluate, budget)
+      except SearchTimeout:
+        break
+
+      bestmove = move
+      budget.depth = depth
+
+      # Search the best move first on the next, deeper iteration
+      moves.remove(move)
+      moves.insert(0, move)
+
+      # A forced win or loss will not change with more depth
+      if abs(bestscore) >= 1:
+        break
+
+    return bestmove
+
+
+def _alphabeta_root(state, depth, moves, maximizing, evaluate, budget):
+    """
+    Searches every move at the root to `depth` plies, returning the best
+    (score, move) pair for the player to move.
+    """
+    alpha = -math.inf
+    beta = math.inf
+    bestmove = None
+    for action in moves:
+      state.play(action)
+      val = _alphabeta(state, depth - 1, alpha, beta, evaluate, budget)
+      state.undo(action)
+      if maximizing and val > alpha:
+        alpha = val
+        bestmove = action
+      elif not maximizing and val < beta:
+        beta = val
+        bestmove = action
+
+    if maximizing:
+      return alpha, bestmove
+    return beta, bestmove
+
+
+def _alphabeta(state, depth, alpha, beta, evaluate, budget):
+    """
+    Returns the alpha-beta value of the state from X's point of view.
+    Wins are worth more the sooner they happen.
+    """
+    budget.nodes += 1
+    if budget.nodes % 1024 == 0 and budget.expired():
+      raise SearchTimeout
+
+    if state.winner == X:
+      return 1 + state.empty
+    elif state.winner == O:
+      return -1 - state.empty
+    elif state.empty == 0:
+      return 0
+    elif depth == 0:
+      return evaluate(state.board, state.k)
+
+    if state.turn == X:
+      val = -math.inf
+      for action in state.moves():
+        state.play(action)
+        val = max(val, _alphabeta(state, depth - 1, alpha, beta, evaluate, budget))
+        state.undo(action)
+        alpha = max(alpha, val)
+        if alpha >= beta:
+          break
+    else:
+      val = math.inf
+      for action in state.moves():
+        state.play(action)
+        val = min(val, _alphabeta(state, depth - 1, alpha, beta, evaluate, budget))
+        state.undo(action)
+        beta = min(beta, val)
+        if alpha >= beta:
+          break
 
     return val
 
+
+# Solved positions shared by every call to table(): maps
+# (board as a tuple of rows, k) to the value of the position for X
+TABLE = {}
+
+
+def table(board, k=None, budget=None):
+    """
+    Returns the optimal action for the current player on the board, like
+    minimax, but remembers the value of every position it solves so that
+    repeated positions, and later calls, are table lookups.
+    Practical only on boards small enough to solve outright.
+    """
+    if terminal(board, k):
+      return None
+
+    state = SearchState(board, k)
+    moves = state.moves()
+    values = []
+    try:
+      for action in moves:
+        state.play(action)
+        values.append(_table_value(state, budget))
+        state.undo(action)
+    except SearchTimeout:
+      return None
+
+    if player(board) == X:
+      return moves[values.index(max(values))]
+    return moves[values.index(min(values))]
+
+
+def _table_value(state, budget):
+    """
+    Returns the game-theoretic value of the state for X, solving and
+    storing it in TABLE if it has not been seen before.
+    """
+    key = (tuple(tuple(row) for row in state.board), state.k)
+    if key in TABLE:
+      return TABLE[key]
+
+    if budget is not None:
+      budget.nodes += 1
+      if budget.cancelled:
+        raise SearchTimeout
+
+    if state.terminal():
+      val = state.utility()
+    else:
+      values = []
+      for action in state.moves():
+        state.play(action)
+        values.append(_table_value(state, budget))
+        state.undo(action)
+      val = max(values) if state.turn == X else min(values)
+
+    TABLE[key] = val
+    return val
@@ -0,0 +1,144 @@
+"""
+Headless self-play tournament between tic-tac-toe engines.
+
+Every pair of engines plays the given number of games, swapping who
+moves first each game, spread over a process pool. Prints win/draw/loss
+rates and move latencies per engine and writes the full results as JSON.
+
+Usage: python tournament.py [-n GAMES] [--rows R --cols C --k K]
+                            [--time SECONDS] [--workers W] [--seed S]
+                            [--output FILE] [engine ...]
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import itertools
+import json
+import math
+import random
+import statistics
+
+import tictactoe as ttt
+from engines import ENGINES, engine
+
+
+def play_game(x_name, o_name, rows, cols, k, time_limit, seed):
+    """
+    Plays one game and returns its winner's engine name (None for a tie)
+    and, for each move, the engine that made it, its seconds and nodes.
+    """
+    random.seed(seed)
+    players = {ttt.X: x_name, ttt.O: o_name}
+    board = ttt.initial_state(rows, cols)
+    moves = []
+    while not ttt.terminal(board, k):
+        name = players[ttt.player(board)]
+        budget = ttt.Budget(time_limit)
+        move = engine(name)(board, k, budget)
+        moves.append({"engine": name, "seconds": budget.elapsed(), "nodes": budget.nodes})
+        board = ttt.result(board, move, k)
+
+    won = ttt.winner(board, k)
+    return {
+        "x": x_name,
+        "o": o_name,
+        "seed": seed,
+        "winner": players[won] if won else None,
+        "moves": moves,
+    }
+
+
+def percentile(values, fraction):
+    """
+    Returns the nearest-rank percentile of a non-empty list of values.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(games, names):
+    """
+    Returns per-engine results: win, draw and loss rates, mean and p99
+    move latency in seconds, and nodes searched per second.
+    """
+    summary = {}
+    for name in names:
+        played = [game for game in games if name in (game["x"], game["o"])]
+        moves = [move for game in played for move in game["moves"]
+                 if move["engine"] == name]
+        wins = sum(1 for game in played if game["winner"] == name)
+        draws = sum(1 for game in played if game["winner"] is None)
+        seconds = [move["seconds"] for move in moves]
+        nodes = sum(move["nodes"] for move in moves)
+        summary[name] = {
+            "games": len(played),
+            "win": wins / len(played) if played else 0.0,
+            "draw": draws / len(played) if played else 0.0,
+            "loss": (len(played) - wins - draws) / len(played) if played else 0.0,
+            "moves": len(moves),
+            "mean_latency": statistics.fmean(seconds) if seconds else 0.0,
+            "p99_latency": percentile(seconds, 0.99) if seconds else 0.0,
+            "nodes_per_second": nodes / sum(seconds) if sum(seconds) else 0.0,
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play engines against each other.")
+    parser.add_argument("engines", nargs="*", default=["random", "alphabeta", "mcts"],
+                        help=f"engines to enter, from {', '.join(ENGINES)}")
+    parser.add_argument("-n", "--games", type=int, default=10,
+                        help="games per pairing")
+    parser.add_argument("--rows", type=int, default=ttt.ROWS)
+    parser.add_argument("--cols", type=int, default=ttt.COLS)
+    parser.add_argument("--k", type=int, default=None)
+    parser.add_argument("--time", type=float, default=0.1,
+                        help="seconds per move for time-limited engines")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes to play games in")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="tournament.json",
+                        help="file to write JSON results to")
+    args = parser.parse_args()
+
+    for name in args.engines:
+        if name not in ENGINES:
+            parser.error(f"unknown engine {name}")
+    names = list(dict.fromkeys(args.engines))
+    if len(names) < 2:
+        parser.error("need at least two different engines")
+
+    # Every pairing plays both colours in turn
+    schedule = []
+    for first, second in itertools.combinations(names, 2):
+        for n in range(args.games):
+            x_name, o_name = (first, second) if n % 2 == 0 else (second, first)
+            schedule.append((x_name, o_name, args.seed + len(schedule)))
+
+    with concurrent.futures.ProcessPoolExecutor(args.workers) as pool:
+        futures = [pool.submit(play_game, x_name, o_name, args.rows, args.cols,
+                               args.k, args.time, seed)
+                   for x_name, o_name, seed in schedule]
+        games = [future.result() for future in futures]
+
+    summary = summarize(games, names)
+    print(f"{'engine':>10} {'win':>6} {'draw':>6} {'loss':>6} "
+          f"{'mean ms':>8} {'p99 ms':>8} {'nodes/s':>10}")
+    for name, row in summary.items():
+        print(f"{name:>10} {row['win']:>6.1%} {row['draw']:>6.1%} {row['loss']:>6.1%} "
+              f"{row['mean_latency'] * 1000:>8.1f} {row['p99_latency'] * 1000:>8.1f} "
+              f"{row['nodes_per_second']:>10.0f}")
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "config": vars(args),
+            "summary": summary,
+            "games": games,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()